@@ -3,6 +3,85 @@
 
 import sys
 import os
+import glob
+
+# Names of the values that are timings: skipped when the timings of a run
+# can't be trusted, checked by their median over the repetitions
+TIMING_VALUES = ['total solver time']
+
+###############################################################################
+def CampaignInfo(infofile) :
+    """Returns the description of the campaign that RunTests wrote
+        --Variable :
+            infofile (string) : path of campaign.info
+        --Function :
+           Every line of campaign.info is a key and its value; they are
+           returned as a dict, which is empty if the file is missing."""
+    info = {}
+    try :
+        with open(infofile, 'r') as fd :
+            for line in fd :
+                cols = line.split(None, 1)
+                if len(cols) == 2 :
+                    info[cols[0]] = cols[1].strip()
+    except IOError :
+        pass
+    return info
+
+###############################################################################
+def HeapProfiled(logfile) :
+    """Returns True if the run of a log file was heap profiled
+        --Variable :
+            logfile (string) : path of the log file
+        --Function :
+           RunTests lists the sessions it ran under valgrind massif (HEAPPROF)
+           in campaign.info.  Rank 0 of those runs is valgrind, so their
+           timings and resource usage are not checked."""
+    return os.path.basename(logfile).split('.')[0] in campaign.get('heapprof', '').split()
+
+###############################################################################
+def GprofProfiled(logfile) :
+    """Returns True if the run of a log file was profiled with gprof
+        --Variable :
+            logfile (string) : path of the log file
+        --Function :
+           RunTests lists the sessions it built with -pg (GPROF) in
+           campaign.info.  Their timings include the profiling, so they are
+           not checked."""
+    return os.path.basename(logfile).split('.')[0] in campaign.get('gprof', '').split()
+
+###############################################################################
+def RepeatMedian(name, logfile, set, value) :
+    """Returns the median of a timing value over a log file and its repetitions
+        --Variable :
+            name (string): name of the test
+            logfile (string) : path of the log file
+            set (list) : ['name',target,tolerance,position] of the value
+            value (float) : value found in logfile
+        --Function :
+           REPEAT in RunTests reruns the serial examples and keeps the logs
+           as <logfile>.r<i>.  The value is read from every repetition and
+           the median is checked instead of the single value; the min and
+           the coefficient of variation are printed with it."""
+    values = [value]
+    for rep in sorted(glob.glob(logfile + ".r*")) :
+        with open(rep, 'r') as log :
+            for line in log :
+                if set[0] in line :
+                    try :
+                        values.append(float(line.split()[-set[3]]))
+                    except (ValueError, IndexError) :
+                        pass
+                    break
+    if len(values) == 1 :
+        return value
+    values.sort()
+    n = len(values)
+    median = values[n//2] if n % 2 else 0.5*(values[n//2-1] + values[n//2])
+    mean = sum(values)/n
+    cv = (sum([(v - mean)**2 for v in values])/(n - 1))**0.5/mean if mean else 0.0
+    print("[%s] %s : min %s, median %s, cv %.1f%% over %d runs"%(name,set[0],values[0],median,100.0*cv,n))
+    return median
 
 ###############################################################################
 def Test(name, logfile,listOfValue)  :
@@ -24,6 +103,21 @@ def Test(name, logfile,listOfValue)  :
     test_result = False
     reported_ValueError = False
     reported_IndexError = False
+    if campaign.get('timing') == 'off' :                   #RunTests found the node loaded
+        for set in list(listOfValue) :
+            if set[0] in TIMING_VALUES :
+                print("[%s] %s : skipped, the node was not quiet"%(name,set[0]))
+                listOfValue.remove(set)
+    if HeapProfiled(logfile) :                             #valgrind's timings and usage are not the run's
+        for set in list(listOfValue) :
+            if '.rusage.' in logfile or set[0] in TIMING_VALUES :
+                print("[%s] %s : skipped, heap profiled under valgrind"%(name,set[0]))
+                listOfValue.remove(set)
+    elif GprofProfiled(logfile) :                          #-pg slows every call down
+        for set in list(listOfValue) :
+            if set[0] in TIMING_VALUES :
+                print("[%s] %s : skipped, profiled with gprof"%(name,set[0]))
+                listOfValue.remove(set)
     numTest = len(listOfValue)                             #Number of tests to do
     success = 0
     num_test += numTest
@@ -56,6 +150,8 @@ def Test(name, logfile,listOfValue)  :
                             print("Warning: Fewer columns than excpected for test \"%s\".  Logfile may be malformatted"%name)
                             reported_IndexError = True
                     else:
+                        if set[0] in TIMING_VALUES :                     #timings are checked by their median over the repetitions
+                            testvalue = RepeatMedian(name, logfile, set, testvalue)
                         print("[%s] %s : %s"%(name,set[0],testvalue))
                         if (abs(testvalue - set[1]) < set[2]) :             #set[1] is the target value / set[2] is the tolerance
                            if (testvalue != 0.0) :                          #Checks that it is not 0.0(failure)
@@ -183,6 +279,7 @@ else:
 ###############################################################################
 num_test = 0 
 num_success = 0
+campaign = CampaignInfo("./campaign.info")
 print("Beginning of top-down testing\n\n")
 print("    . : successful test, F : failed test\n\n")
 ###############################################################################
@@ -922,6 +1019,10 @@ if ifmpi:
     value = [['X err',6.007702E-07,1e-06,6],['Y err',6.489061E-07,1e-06,6]]
     Run("Example eddy/MPI: Parallel-error",log,value)
 
+    log = "./mpiLog/eddy_uv.rusage.4"
+    value = [['rss/static ratio',0,2,1]]
+    Run("Example eddy/MPI: Parallel-memory",log,value)
+
 #SRL
 log = "./srlLog/eddy_uv.log.1"
 value = [['total solver time',0.1,80,2],
@@ -932,6 +1033,10 @@ log = "./srlLog/eddy_uv.err.1"
 value = [['X err',6.007702E-07,1e-06,6],['Y err',6.489061E-07,1e-06,6]]
 Run("Example eddy/SRL: Serial-error",log,value)
 
+log = "./srlLog/eddy_uv.rusage.1"
+value = [['rss/static ratio',0,2,1]]
+Run("Example eddy/SRL: Serial-memory",log,value)
+
 #MPI2
 if ifmpi:
 
@@ -2,10 +2,16 @@
 # Python module to run top-down tests for Nek
 
 import collections
+import glob
+import os
 import re
 import sys
 import unittest
 
+# Names of the test values that are timings: skipped when the timings of a
+# run can't be trusted, checked by their median over the repetitions
+TIMING_VALUES = ['total solver time']
+
 
 ###############################################################################
 class TestVals(dict):
@@ -122,6 +128,8 @@ class RunTestClass(unittest.TestCase):
                             except (ValueError, IndexError):
                                 pass
                             else:
+                                if testName in TIMING_VALUES:
+                                    testVal = repeatMedian(cls.exampleName, cls.logfile, testName, col, testVal)
                                 cls.foundTests[testName] = cls.missingTests.pop(testName)
                                 cls.foundTests[testName]['testVal'] = testVal
         except IOError:
@@ -144,6 +152,93 @@ class RunTestClass(unittest.TestCase):
         print("")
 
 
+def repeatMedian(exampleName, logfile, testName, col, value):
+    """ Returns the median of a timing value over a logfile and its repetitions
+
+    REPEAT in RunTests reruns the serial examples and keeps the logs as
+    <logfile>.r<i>.  The value is read from every repetition and the median
+    is checked instead of the single value; the min and the coefficient of
+    variation are printed with it.
+
+    Arguments:
+        exampleName (string):  The name of the example problem
+        logfile (string):  Path to the logfile
+        testName (string):  Name of the value
+        col (int):  Column of the value, counted from the right (negative)
+        value (float):  Value found in logfile
+    """
+    values = [value]
+    for rep in sorted(glob.glob(logfile + '.r*')):
+        with open(rep, 'r') as fd:
+            for line in fd:
+                if testName in line:
+                    try:
+                        values.append(float(line.split()[col]))
+                    except (ValueError, IndexError):
+                        pass
+                    break
+    if len(values) == 1:
+        return value
+    values.sort()
+    n = len(values)
+    median = values[n // 2] if n % 2 else 0.5 * (values[n // 2 - 1] + values[n // 2])
+    mean = sum(values) / n
+    cv = (sum([(v - mean) ** 2 for v in values]) / (n - 1)) ** 0.5 / mean if mean else 0.0
+    print("[%s] %s : min %s, median %s, cv %.1f%% over %d runs" % (exampleName, testName, values[0], median,
+                                                                   100.0 * cv, n))
+    return median
+
+
+def campaignInfo(infofile):
+    """ Returns the description of the campaign that RunTests wrote
+
+    Every line of campaign.info is a key and its value.
+
+    Arguments:
+        infofile (string):  Path of campaign.info
+
+    Returns:
+        dict of {key: value}; empty if the file is missing
+    """
+    info = {}
+    try:
+        with open(infofile, 'r') as fd:
+            for line in fd:
+                cols = line.split(None, 1)
+                if len(cols) == 2:
+                    info[cols[0]] = cols[1].strip()
+    except IOError:
+        pass
+    return info
+
+
+def heapProfiled(logfile):
+    """ Returns True if the run of a logfile was heap profiled
+
+    RunTests lists the sessions it ran under valgrind massif (HEAPPROF) in
+    campaign.info.  Rank 0 of those runs is valgrind, so their timings and
+    resource usage are not checked.
+
+    Globals:
+        campaign (dict):  campaign.info, see campaignInfo
+    """
+    global campaign
+    return os.path.basename(logfile).split('.')[0] in campaign.get('heapprof', '').split()
+
+
+def gprofProfiled(logfile):
+    """ Returns True if the run of a logfile was profiled with gprof
+
+    RunTests lists the sessions it built with -pg (GPROF) in campaign.info.
+    Their timings include the profiling, so they are not checked.
+
+    Globals:
+        campaign (dict):  campaign.info, see campaignInfo
+    """
+    global campaign
+    return os.path.basename(logfile).split('.')[0] in campaign.get('gprof', '').split()
+
+
 def Run(exampleName, logfile, listOfTests):
     """ Set up multiple tests for one example problem.
 
@@ -158,8 +253,25 @@ def Run(exampleName, logfile, listOfTests):
 
     Globals:
         suite (TestSuite): a previously-instantiated TestSuite to which the test cases will be added
+        campaign (dict): campaign.info, see campaignInfo
     """
     global suite
+    global campaign
+    if campaign.get('timing') == 'off':
+        for test in list(listOfTests):
+            if test[0] in TIMING_VALUES:
+                print("[%s] %s : skipped, the node was not quiet" % (exampleName, test[0]))
+                listOfTests.remove(test)
+    if heapProfiled(logfile):
+        for test in list(listOfTests):
+            if '.rusage.' in logfile or test[0] in TIMING_VALUES:
+                print("[%s] %s : skipped, heap profiled under valgrind" % (exampleName, test[0]))
+                listOfTests.remove(test)
+    elif gprofProfiled(logfile):
+        for test in list(listOfTests):
+            if test[0] in TIMING_VALUES:
+                print("[%s] %s : skipped, profiled with gprof" % (exampleName, test[0]))
+                listOfTests.remove(test)
     validName = re.sub(r'[_\W]+', '_', 'NekTest_%s' % exampleName)
     cls = type(validName, (RunTestClass,), {})
     cls.addTests(exampleName, logfile, listOfTests)
@@ -321,6 +433,8 @@ if __name__ == '__main__':
     __unittest = True
     global suite
     suite = unittest.TestSuite()
+    global campaign
+    campaign = campaignInfo('./campaign.info')
 
     #  Check if mpi tests were run..
     if "mpi" in sys.argv:
@@ -1086,6 +1200,10 @@ if __name__ == '__main__':
         value = [['X err',6.007702E-07,1e-06,6],['Y err',6.489061E-07,1e-06,6]]
         Run("Example eddy/MPI: Parallel-error",log,value)
 
+        log = "./mpiLog/eddy_uv.rusage.4"
+        value = [['rss/static ratio',0,2,1]]
+        Run("Example eddy/MPI: Parallel-memory",log,value)
+
     #SRL
     log = "./srlLog/eddy_uv.log.1"
     value = [['total solver time',0.1,80,2],
@@ -1096,6 +1214,10 @@ if __name__ == '__main__':
     value = [['X err',6.007702E-07,1e-06,6],['Y err',6.489061E-07,1e-06,6]]
     Run("Example eddy/SRL: Serial-error",log,value)
 
+    log = "./srlLog/eddy_uv.rusage.1"
+    value = [['rss/static ratio',0,2,1]]
+    Run("Example eddy/SRL: Serial-memory",log,value)
+
     #MPI2
     if ifmpi:
 
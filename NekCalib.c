@@ -0,0 +1,80 @@
+/*
+ * Calibration microbenchmark of the Nek tests, run by RunTests before
+ * the examples.  Measures the memory bandwidth (STREAM triad) and the
+ * speed of a small dense kernel (the mxm products of a spectral element
+ * of order 8) and prints them as 'name value' lines for campaign.info.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#define N      (1 << 22)
+#define NTRIAD 10
+#define LX     8
+#define NMXM   200000
+
+static double now(void)
+{
+    struct timespec t;
+    clock_gettime(CLOCK_MONOTONIC, &t);
+    return t.tv_sec + 1e-9 * t.tv_nsec;
+}
+
+static void mxm(const double *a, int n1, const double *b, int n2, double *c, int n3)
+{
+    int i, j, k;
+    for (j = 0; j < n3; j++)
+        for (i = 0; i < n1; i++) {
+            double s = 0.0;
+            for (k = 0; k < n2; k++)
+                s += a[i + n1 * k] * b[k + n2 * j];
+            c[i + n1 * j] = s;
+        }
+}
+
+int main(void)
+{
+    double *a = malloc(N * sizeof(double));
+    double *b = malloc(N * sizeof(double));
+    double *c = malloc(N * sizeof(double));
+    double best = 1e30, t, sum = 0.0;
+    int i, r;
+
+    if (!a || !b || !c) {
+        fprintf(stderr, "NekCalib: out of memory\n");
+        return 1;
+    }
+    for (i = 0; i < N; i++) {
+        a[i] = 0.0;
+        b[i] = 1.0;
+        c[i] = 2.0;
+    }
+
+    /* best of NTRIAD triads */
+    for (r = 0; r < NTRIAD; r++) {
+        t = now();
+        for (i = 0; i < N; i++)
+            a[i] = b[i] + 3.0 * c[i];
+        t = now() - t;
+        if (t < best)
+            best = t;
+        sum += a[r];
+    }
+    printf("bandwidth %.0f\n", 3.0 * sizeof(double) * N / best / 1e6);
+
+    /* derivative of an element: (LX x LX) times (LX x LX*LX) */
+    t = now();
+    for (r = 0; r < NMXM; r++) {
+        mxm(b + (r % 64), LX, c, LX, a, LX * LX);
+        sum += a[r % (LX * LX * LX)];
+    }
+    t = now() - t;
+    printf("mxm       %.0f\n", 2.0 * LX * LX * LX * LX * NMXM / t / 1e6);
+
+    if (sum == 0.0)
+        fprintf(stderr, "NekCalib: %g\n", sum);
+    free(a);
+    free(b);
+    free(c);
+    return 0;
+}
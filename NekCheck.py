@@ -0,0 +1,1103 @@
+#! /usr/bin/python
+# Python module with numerical checks of the nek output for the Nek tests
+#
+# Analysis.py checks a few values that the examples print.  The checks here
+# compare whole results with references: the final fields of every run, its
+# time series and every number of its log.
+# They need numpy, which is only imported when a check runs.
+
+import argparse
+import collections
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import time
+import zlib
+
+
+###############################################################################
+def numpy():
+    """ Returns the numpy module
+
+    Raises:
+        ImportError with the reason if numpy is missing
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("THE 'numpy' MODULE COULD NOT BE FOUND!  The field checks need it; "
+                          "install 'numpy' (available from Python Package Index)")
+    return numpy
+
+
+###############################################################################
+# The header of a binary field file is 132 characters:
+#     #std <wdsize> <lx> <ly> <lz> <nelt> <nelgt> <time> <istep> <fid> <nfiles> <rdcode>
+# followed by the float32 6.54321, which tells the byte order, the global
+# number of every element in the file (int32) and one block per field in
+# rdcode: X (coordinates), U (velocity), P (pressure), T (temperature),
+# S<nn> (nn passive scalars).  A block holds, element after element, the
+# lx*ly*lz points of every component.
+FIELD_HEADER = 132
+FIELD_TAG = 6.54321
+
+
+class FieldFile(object):
+    """ A nek binary field file, whose data is memory-mapped, not read
+
+    Attributes:
+        filename (string):  Path of the file
+        wdsize (int):  Bytes per value, 4 or 8
+        lx, ly, lz (int):  Points per element and direction
+        nelt (int):  Number of elements in the file
+        nelgt (int):  Number of elements of the mesh
+        time (float):  Simulation time of the fields
+        istep (int):  Step of the fields
+        byteorder (string):  '<' (little-endian) or '>' (big-endian)
+        dtype (numpy.dtype):  Type of the values, with the byte order of the file
+        ids (numpy.memmap):  Global number of every element
+        fields (OrderedDict):  {name: (offset, components)} of every field
+    """
+
+    def __init__(self, filename):
+        np = numpy()
+        self.filename = filename
+        with open(filename, 'rb') as fd:
+            header = fd.read(FIELD_HEADER).decode('ascii', 'replace')
+            tag = fd.read(4)
+        if not header.startswith('#std') or len(tag) != 4:
+            raise ValueError("%s is not a nek binary field file" % filename)
+        cols = header[4:].split()
+        try:
+            (self.wdsize, self.lx, self.ly, self.lz, self.nelt, self.nelgt) = [int(c) for c in cols[:6]]
+            self.time = float(cols[6].replace('D', 'E'))
+            self.istep = int(cols[7])
+        except (ValueError, IndexError):
+            raise ValueError("%s has a corrupt header" % filename)
+        rdcode = ''.join(cols[10:])
+
+        for order in ('<', '>'):
+            if abs(np.frombuffer(tag, order + 'f4')[0] - FIELD_TAG) < 1e-5:
+                break
+        else:
+            raise ValueError("%s has no byte order tag" % filename)
+        if self.wdsize not in (4, 8):
+            raise ValueError("%s has %d-byte values" % (filename, self.wdsize))
+        self.byteorder = order
+        self.dtype = np.dtype('%sf%d' % (order, self.wdsize))
+
+        offset = FIELD_HEADER + 4
+        self.ids = np.memmap(filename, dtype=order + 'i4', mode='r', offset=offset, shape=(self.nelt,))
+        offset += 4 * self.nelt
+        ndim = 3 if self.lz > 1 else 2
+        self.fields = collections.OrderedDict()
+        i = 0
+        while i < len(rdcode):
+            code = rdcode[i]
+            if code in 'XU':
+                (names, i) = ([(code, ndim)], i + 1)
+            elif code in 'PT':
+                (names, i) = ([(code, 1)], i + 1)
+            elif code == 'S':
+                count = int(rdcode[i + 1:i + 3])
+                (names, i) = ([('S%02d' % (k + 1), 1) for k in range(count)], i + 3)
+            else:
+                raise ValueError("%s has an unknown field %s" % (filename, code))
+            for (name, ncomp) in names:
+                self.fields[name] = (offset, ncomp)
+                offset += self.nelt * ncomp * self.points() * self.wdsize
+        if offset > os.path.getsize(filename):
+            raise ValueError("%s is truncated" % filename)
+
+    def points(self):
+        """ Returns the number of points of an element """
+        return self.lx * self.ly * self.lz
+
+    def field(self, name):
+        """ Returns a field as a read-only (elements, components, points) view of the file """
+        (offset, ncomp) = self.fields[name]
+        return numpy().memmap(self.filename, dtype=self.dtype, mode='r', offset=offset,
+                              shape=(self.nelt, ncomp, self.points()))
+
+
+def elementReader(fieldfile):
+    """ Returns read(name, start, stop), which returns elements start to stop
+    of a field of a FieldFile in the order of their global numbers, as float64
+    """
+    np = numpy()
+    order = np.argsort(fieldfile.ids, kind='mergesort')
+    if np.array_equal(order, np.arange(fieldfile.nelt)):
+        order = None
+
+    def read(name, start, stop):
+        data = fieldfile.field(name)
+        if order is None:
+            return np.asarray(data[start:stop], dtype=np.float64)
+        return np.asarray(data[order[start:stop]], dtype=np.float64)
+    return read
+
+
+def fieldNorms(readRun, readRef, name, nelt, chunk=4096):
+    """ Returns the differences of one field of a run and its reference
+
+    The field is compared chunk elements at a time, so that only a chunk of
+    either is in memory.
+
+    Arguments:
+        readRun, readRef (function):  read(name, start, stop) of the run and
+            the reference, see elementReader and ReferenceStore.reader
+        name (string):  Field
+        nelt (int):  Number of elements
+
+    Returns:
+        (relative L2 difference, relative Linf difference), relative to the
+        L2 norm and the largest absolute value of the reference field
+    """
+    np = numpy()
+    (diff2, ref2, diffmax, refmax) = (0.0, 0.0, 0.0, 0.0)
+    for start in range(0, nelt, chunk):
+        x = readRun(name, start, start + chunk)
+        y = readRef(name, start, start + chunk)
+        d = x - y
+        diff2 += float(np.dot(d.ravel(), d.ravel()))
+        ref2 += float(np.dot(y.ravel(), y.ravel()))
+        diffmax = max(diffmax, float(np.abs(d).max()))
+        refmax = max(refmax, float(np.abs(y).max()))
+    return (math.sqrt(diff2 / ref2) if ref2 > 0 else math.sqrt(diff2),
+            diffmax / refmax if refmax > 0 else diffmax)
+
+
+# Default tolerance of the relative differences of a field
+FIELD_TOL = 1e-6
+
+
+def fieldTolerance(tolerances, name):
+    """ Returns the tolerance of a field from {field: tolerance}, 'all' or FIELD_TOL """
+    tolerances = tolerances or {}
+    return tolerances.get(name, tolerances.get('all', FIELD_TOL))
+
+
+def compareFields(run, readRef, geometry, fields, tolerances=None, chunk=4096):
+    """ Compares every field of a FieldFile with a reference
+
+    Arguments:
+        run (FieldFile):  Fields of the run
+        readRef (function):  read(name, start, stop) of the reference
+        geometry (tuple):  (lx, ly, lz, nelt, nelgt) of the reference
+        fields (list of string):  Fields of the reference
+        tolerances (dict):  {field: tolerance} of the relative L2 and Linf
+            differences, see fieldTolerance
+        chunk (int):  Elements compared at a time
+
+    Returns:
+        list of (field, relative L2, relative Linf, tolerance, passed); the
+        field is None if the run doesn't have the discretization of the reference
+    """
+    if (run.lx, run.ly, run.lz, run.nelt, run.nelgt) != tuple(geometry):
+        return [(None, float('inf'), float('inf'), 0.0, False)]
+    readRun = elementReader(run)
+    results = []
+    for name in run.fields:
+        if name not in fields:
+            continue
+        tol = fieldTolerance(tolerances, name)
+        (l2, linf) = fieldNorms(readRun, readRef, name, run.nelt, chunk)
+        results.append((name, l2, linf, tol, l2 <= tol and linf <= tol))
+    return results
+
+
+def parseTolerances(specs):
+    """ Returns {field: tolerance} from a list like ['U=1e-6', 'P=1e-4', 'all=1e-5'] """
+    tolerances = {}
+    for spec in specs or []:
+        (name, value) = spec.split('=')
+        tolerances[name.strip()] = float(value)
+    return tolerances
+
+
+###############################################################################
+# Fraction of the tolerance of a field that its references are quantized to,
+# relative to the RMS of the field; a stored value is off by at most half of
+# that, which is a small fraction of both the L2 norm and the largest absolute
+# value of the field (the RMS is never above the latter)
+QUANT = 0.1
+# Seconds that a compiler waits for the base of a run, which a concurrent
+# campaign is storing, before it gives up storing its own reference; a run
+# directory without its base that nobody wrote to for that long is stale
+BASE_WAIT = 300
+BASE_POLL = 2
+
+
+class ReferenceStore(object):
+    """ Reference fields of the runs of one log directory, for all compilers
+
+    Every run (<rea>.final.<np>) has a directory with
+        store.json        the discretization, the elements per block and,
+                          for every field, the quantization step; written
+                          once, by the first compiler, which is the base
+        <compiler>.json   time, step and the blocks of every field
+        <compiler>.bin    the compressed blocks
+    The fields are stored in the order of the global element numbers and
+    quantized to integer multiples of their step (QUANT times the tolerance
+    times the RMS of the base field).  Blocks of the base
+    hold the differences between neighboring points, blocks of the other
+    compilers the difference to the base; either is mostly small integers,
+    which are stored in the smallest integer type that fits and compressed
+    with zlib.  Every block of chunk elements is compressed on its own, so
+    that an element range of one field is read without the rest.
+
+    Attributes:
+        root (string):  Directory of the reference fields of the log directory
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, run, name):
+        return os.path.join(self.root, run, name)
+
+    def _load(self, run, name):
+        try:
+            with open(self._path(run, name), 'r') as fd:
+                return json.load(fd)
+        except IOError:
+            return None
+
+    def store(self, run):
+        """ Returns the store.json of a run, or None """
+        return self._load(run, 'store.json')
+
+    def compilers(self, run):
+        """ Returns the compilers that have a reference of a run """
+        return sorted([os.path.basename(f)[:-5] for f in glob.glob(self._path(run, '*.json'))
+                       if not f.endswith('store.json')])
+
+    def waitForBase(self, run, base, wait=None):
+        """ Returns True once the base of a run is stored, False if it isn't within wait seconds
+
+        Another campaign can have written store.json and still be storing the
+        blocks of the base.
+        """
+        deadline = time.time() + (BASE_WAIT if wait is None else wait)
+        while base not in self.compilers(run):
+            if time.time() >= deadline:
+                return False
+            time.sleep(BASE_POLL)
+        return True
+
+    def dropStale(self, run, meta):
+        """ Removes the store.json of a run whose base was never stored
+
+        The campaign of the base can die between writing store.json and the
+        index of the base.  store.json is stale if the base is still missing
+        and nothing in the run directory changed for BASE_WAIT seconds; the
+        next compiler to store the run then becomes its base.
+
+        Returns:
+            True if store.json was stale
+        """
+        rundir = os.path.join(self.root, run)
+        if meta['base'] in self.compilers(run):
+            return False
+        newest = max([os.path.getmtime(f) for f in glob.glob(os.path.join(rundir, '*'))] or [0])
+        if time.time() - newest < BASE_WAIT:
+            return False
+        tmp = self._path(run, 'store.json.stale.%d' % os.getpid())
+        try:
+            os.rename(self._path(run, 'store.json'), tmp)
+        except OSError:
+            return True
+        # Another campaign may have rebuilt it in the meantime: put that one back
+        with open(tmp, 'r') as fd:
+            if json.load(fd) != meta:
+                try:
+                    os.link(tmp, self._path(run, 'store.json'))
+                except OSError:
+                    pass
+        os.remove(tmp)
+        return True
+
+    def put(self, run, compiler, fieldfile, tolerances=None, chunk=256):
+        """ Stores the fields of a FieldFile as the reference of a compiler
+
+        The first compiler of a run becomes its base.  The other compilers
+        store their difference to the base, so they wait for it (see
+        waitForBase), or rebuild a stale store.json (see dropStale).  The
+        base compiler stores its reference again if its index is missing.
+
+        Returns:
+            True if the reference was stored, False if the base wasn't ready
+        """
+        np = numpy()
+        read = elementReader(fieldfile)
+        rundir = os.path.join(self.root, run)
+        if not os.path.isdir(rundir):
+            os.makedirs(rundir)
+
+        meta = self.store(run)
+        if meta is None:
+            fields = collections.OrderedDict()
+            for (name, (offset, ncomp)) in fieldfile.fields.items():
+                (sum2, size) = (0.0, 0)
+                for start in range(0, fieldfile.nelt, chunk):
+                    block = read(name, start, start + chunk)
+                    if not np.isfinite(block).all():
+                        raise ValueError("%s has non-finite values in %s" % (fieldfile.filename, name))
+                    sum2 += float(np.dot(block.ravel(), block.ravel()))
+                    size += block.size
+                rms = math.sqrt(sum2 / size) if size else 0.0
+                step = QUANT * fieldTolerance(tolerances, name) * (rms or 1.0)
+                fields[name] = {'components': ncomp, 'step': step}
+            meta = {'geometry': [fieldfile.lx, fieldfile.ly, fieldfile.lz, fieldfile.nelt, fieldfile.nelgt],
+                    'chunk': chunk, 'base': compiler, 'fields': fields}
+            # Only one compiler can become the base
+            tmp = self._path(run, 'store.json.%d' % os.getpid())
+            with open(tmp, 'w') as fd:
+                json.dump(meta, fd, indent=1)
+            try:
+                os.link(tmp, self._path(run, 'store.json'))
+            except OSError:
+                meta = self.store(run)
+            os.remove(tmp)
+        if meta['geometry'] != [fieldfile.lx, fieldfile.ly, fieldfile.lz, fieldfile.nelt, fieldfile.nelgt]:
+            raise ValueError("%s doesn't have the discretization of the reference" % fieldfile.filename)
+
+        if compiler != meta['base'] and not self.waitForBase(run, meta['base']):
+            if self.dropStale(run, meta):
+                return self.put(run, compiler, fieldfile, tolerances, chunk)
+            return False
+        base = None if compiler == meta['base'] else self.reader(run, meta['base'], quantized=True)
+        index = {'time': fieldfile.time, 'istep': fieldfile.istep, 'blocks': {}}
+        tmp = self._path(run, '%s.bin.%d' % (compiler, os.getpid()))
+        with open(tmp, 'wb') as fd:
+            for (name, info) in meta['fields'].items():
+                if name not in fieldfile.fields:
+                    continue
+                blocks = []
+                for start in range(0, fieldfile.nelt, meta['chunk']):
+                    stop = start + meta['chunk']
+                    values = read(name, start, stop) / info['step']
+                    if not np.isfinite(values).all() or np.abs(values).max() >= 2.0 ** 62:
+                        raise ValueError("%s can't be quantized in %s" % (fieldfile.filename, name))
+                    q = np.rint(values).astype(np.int64)
+                    if base is None:
+                        q = np.diff(q, axis=-1, prepend=0)
+                    else:
+                        q = q - base(name, start, stop)
+                    blocks.append(self._encode(fd, q))
+                index['blocks'][name] = blocks
+        os.rename(tmp, self._path(run, '%s.bin' % compiler))
+        tmp = self._path(run, '%s.json.%d' % (compiler, os.getpid()))
+        with open(tmp, 'w') as fd:
+            json.dump(index, fd)
+        os.rename(tmp, self._path(run, '%s.json' % compiler))
+        return True
+
+    @staticmethod
+    def _encode(fd, q):
+        """ Writes one block of integers to fd; returns [offset, bytes, type, elements] """
+        np = numpy()
+        peak = int(np.abs(q).max()) if q.size else 0
+        for dtype in ('<i1', '<i2', '<i4', '<i8'):
+            if peak < 2 ** (8 * int(dtype[-1]) - 1):
+                break
+        data = zlib.compress(q.astype(dtype).tobytes(), 6)
+        offset = fd.tell()
+        fd.write(data)
+        return [offset, len(data), dtype, q.shape[0]]
+
+    def reader(self, run, compiler, quantized=False):
+        """ Returns read(name, start, stop) of the reference of a compiler
+
+        It returns elements start to stop (in the order of their global
+        numbers) of a field, decoding only the blocks they are in.  With
+        quantized, it returns the integer multiples of the step.
+        """
+        np = numpy()
+        meta = self.store(run)
+        index = self._load(run, '%s.json' % compiler)
+        if meta is None or index is None:
+            raise ValueError("no reference of %s for %s" % (run, compiler))
+        chunk = meta['chunk']
+        base = None if compiler == meta['base'] else self.reader(run, meta['base'], quantized=True)
+        datafile = self._path(run, '%s.bin' % compiler)
+
+        def read(name, start, stop):
+            if name not in meta['fields']:
+                raise ValueError("no field %s in the reference of %s" % (name, run))
+            info = meta['fields'][name]
+            points = meta['geometry'][0] * meta['geometry'][1] * meta['geometry'][2]
+            stop = min(stop, meta['geometry'][3])
+            if start >= stop:
+                return np.zeros((0, info['components'], points))
+            parts = []
+            with open(datafile, 'rb') as fd:
+                for b in range(start // chunk, (stop - 1) // chunk + 1):
+                    (offset, length, dtype, nelt) = index['blocks'][name][b]
+                    fd.seek(offset)
+                    q = np.frombuffer(zlib.decompress(fd.read(length)), dtype=dtype).astype(np.int64)
+                    parts.append(q.reshape(nelt, info['components'], points))
+            q = np.concatenate(parts)[start - (start // chunk) * chunk:][:stop - start]
+            if base is None:
+                q = np.cumsum(q, axis=-1)
+            else:
+                q = q + base(name, start, stop)
+            return q if quantized else q * info['step']
+        return read
+
+
+def fieldReport(logdir, refdir, compiler, tolerances=None, chunk=4096):
+    """ Compares the final fields of every run in logdir with the references in refdir
+
+    RunTests keeps the last field file of every run as <rea>.final.<np> in
+    the log directory.  A run is compared with the reference of its compiler.
+    If there is none, it becomes the reference of its compiler, is compared
+    with the reference of the base compiler for information and must pass
+    against its own stored reference.
+
+    Arguments:
+        logdir (string):  Log directory, e.g. srlLog
+        refdir (string):  ReferenceStore of that log directory
+        compiler (string):  Compiler of the campaign
+        tolerances (dict):  {field: tolerance}, see fieldTolerance
+        chunk (int):  Elements compared at a time
+    """
+    store = ReferenceStore(refdir)
+    num_test = 0
+    num_success = 0
+    for runfile in sorted(glob.glob(os.path.join(logdir, '*.final.*'))):
+        run = os.path.basename(runfile)
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        meta = store.store(run)
+        results = []
+        try:
+            fieldfile = FieldFile(runfile)
+            if meta is None or compiler not in store.compilers(run):
+                if not store.put(run, compiler, fieldfile, tolerances):
+                    print("[%s] not kept: the base reference is still being stored" % name)
+                    continue
+                meta = store.store(run)
+                if compiler != meta['base']:
+                    print("[%s] no reference for %s yet; against the one of %s:" % (name, compiler, meta['base']))
+                    for (field, l2, linf, tol, passed) in compareFields(fieldfile, store.reader(run, meta['base']),
+                                                                        meta['geometry'], meta['fields'],
+                                                                        tolerances, chunk):
+                        if field is not None:
+                            print("[%s] %-3s : L2 %.3e, Linf %.3e" % (name, field, l2, linf))
+                # The stored reference must pass against the run it was made of
+                print("[%s] kept as the reference for %s; round trip:" % (name, compiler))
+            results = compareFields(fieldfile, store.reader(run, compiler), meta['geometry'],
+                                    meta['fields'], tolerances, chunk)
+        except ValueError as e:
+            print("[%s] %s" % (name, e))
+        failed = not results
+        for (field, l2, linf, tol, passed) in results:
+            if field is None:
+                print("[%s] discretization differs from the reference" % name)
+            else:
+                print("[%s] %-3s : L2 %.3e, Linf %.3e (tol %.1e)" % (name, field, l2, linf, tol))
+            failed = failed or not passed
+        num_test += 1
+        if failed:
+            print("%s : F " % name)
+        else:
+            num_success += 1
+            print("%s : ." % name)
+    print("\n\nField Summary :     %i/%i field checks were successful" % (num_success, num_test))
+
+
+def storeReport(refdir):
+    """ Prints the references of every run in a ReferenceStore with their compressed size """
+    store = ReferenceStore(refdir)
+    print("%-24s %-8s %12s %12s %8s" % ('run', 'compiler', 'raw (kB)', 'stored (kB)', 'ratio'))
+    for rundir in sorted(glob.glob(os.path.join(refdir, '*'))):
+        run = os.path.basename(rundir)
+        meta = store.store(run)
+        if meta is None:
+            continue
+        (lx, ly, lz, nelt, nelgt) = meta['geometry']
+        raw = 8 * nelt * lx * ly * lz * sum([f['components'] for f in meta['fields'].values()])
+        for compiler in store.compilers(run):
+            size = os.path.getsize(os.path.join(rundir, '%s.bin' % compiler))
+            print("%-24s %-8s %12.1f %12.1f %8.1f%s" %
+                  (run, compiler, raw / 1024.0, size / 1024.0, raw / float(size or 1),
+                   '  (base)' if compiler == meta['base'] else ''))
+
+
+###############################################################################
+# Time series.  hpts.out has one line per history point and output step:
+# the time and the values (u, v, [w,] p, [t]) at the point.  For the other
+# examples, the series is made of the numbers on the lines of a log that
+# contain the keyword of their error check (drag, amp, ...).
+def parseRows(text):
+    """ Returns the numbers of the lines of text as a (rows, columns) array
+
+    Lines that start with '#' and lines with another number of columns than
+    the first one are skipped.
+    """
+    np = numpy()
+    lines = [l for l in text.replace('D', 'E').replace('d', 'e').splitlines()
+             if l.strip() and not l.lstrip().startswith('#')]
+    if not lines:
+        return np.zeros((0, 0))
+    ncol = len(lines[0].split())
+    lines = [l for l in lines if len(l.split()) == ncol]
+    return np.array(' '.join(lines).split(), dtype=np.float64).reshape(len(lines), ncol)
+
+
+def readHpts(filename):
+    """ Reads hpts.out into (times (steps,), values (steps, points, variables)) """
+    with open(filename, 'r') as fd:
+        rows = parseRows(fd.read())
+    if not rows.size:
+        raise ValueError("%s has no history points" % filename)
+    times = rows[:, 0]
+    # The points of one step have the same time
+    npoints = int(numpy().argmax(times != times[0])) or len(times)
+    nsteps = len(times) // npoints
+    rows = rows[:nsteps * npoints]
+    return (times[::npoints][:nsteps], rows[:, 1:].reshape(nsteps, npoints, rows.shape[1] - 1))
+
+
+# Position of the time among the numbers of a keyword line: the examples
+# print the step first and the time second
+SERIES_TIME = 2
+
+
+def readSeries(filename, timecol=SERIES_TIME):
+    """ Reads the keyword lines of a log (<rea>.series.<np>) into (times, values (steps, 1, variables))
+
+    Tokens that are not numbers are dropped.  The timecol-th number of a line
+    is its time and the numbers after it are the values; the ones before it
+    (the step) are left out.  With timecol 0, all numbers are values and the
+    times are the line numbers.
+    """
+    rows = []
+    with open(filename, 'r') as fd:
+        for line in fd:
+            numbers = []
+            for token in line.replace('D', 'E').split():
+                try:
+                    numbers.append(float(token))
+                except ValueError:
+                    pass
+            if len(numbers) > 1:
+                rows.append(' '.join([repr(n) for n in numbers]))
+    rows = parseRows('\n'.join(rows))
+    if not rows.size or rows.shape[1] <= timecol:
+        raise ValueError("%s has no time series" % filename)
+    if timecol == 0:
+        times = numpy().arange(1, rows.shape[0] + 1, dtype=float)
+    else:
+        times = rows[:, timecol - 1]
+    return (times, rows[:, timecol:].reshape(rows.shape[0], 1, rows.shape[1] - timecol))
+
+
+def parseColumns(specs):
+    """ Returns {session: position} from a list like ['ext_cyl=1', 'st1=0'] """
+    columns = {}
+    for spec in specs or []:
+        (name, value) = spec.split('=')
+        columns[name.strip()] = int(value)
+    return columns
+
+
+def compareSeries(run, ref, rtol=1e-6, atol=1e-10):
+    """ Compares two time series value by value
+
+    Arguments:
+        run, ref (tuple):  (times, values) of readHpts or readSeries
+
+    Returns:
+        dict with 'steps' (compared), 'missing' (steps only in one of them),
+        'failed' (values out of tolerance), 'first' (time of the first step
+        with a value out of tolerance, or None) and 'maxdiff' (largest
+        absolute difference per variable)
+    """
+    np = numpy()
+    (timesA, a) = run
+    (timesB, b) = ref
+    n = min(len(timesA), len(timesB))
+    if a.shape[1:] != b.shape[1:]:
+        raise ValueError("the series have %s and %s points and variables" % (a.shape[1:], b.shape[1:]))
+    (a, b) = (a[:n], b[:n])
+    diff = np.abs(a - b)
+    bad = diff > atol + rtol * np.abs(b)
+    bad[~np.isclose(timesA[:n], timesB[:n], rtol=1e-9, atol=0.0)] = True
+    steps = np.nonzero(bad.any(axis=(1, 2)))[0]
+    return {'steps': n, 'missing': abs(len(timesA) - len(timesB)), 'failed': int(bad.sum()),
+            'first': float(timesA[steps[0]]) if len(steps) else None,
+            'maxdiff': diff.max(axis=(0, 1)) if n else np.zeros(a.shape[2])}
+
+
+def spectrum(series):
+    """ Returns the dominant frequency and its amplitude of every point and variable
+
+    The series is taken as uniformly sampled at its mean time step; the mean
+    of every variable is removed first.
+
+    Returns:
+        (frequencies, amplitudes), both (points, variables); the frequency is
+        in the units of the time column, and its resolution is 1/(duration)
+    """
+    np = numpy()
+    (times, values) = series
+    if len(times) < 4:
+        raise ValueError("a series of %d steps has no spectrum" % len(times))
+    dt = (times[-1] - times[0]) / (len(times) - 1)
+    signal = values - values.mean(axis=0)
+    power = np.abs(np.fft.rfft(signal, axis=0))
+    peak = power[1:].argmax(axis=0) + 1
+    freqs = np.fft.rfftfreq(len(times), dt)[peak]
+    amps = 2.0 * np.take_along_axis(power, peak[np.newaxis], axis=0)[0] / len(times)
+    return (freqs, amps)
+
+
+def compareSpectra(run, ref, rtol=0.01):
+    """ Compares the dominant frequencies and amplitudes of two time series
+
+    A frequency may differ by rtol or one frequency bin, an amplitude by rtol
+    of the largest amplitude of its variable.  Frequencies are only compared
+    where the variable oscillates, with at least a thousandth of that amplitude.
+
+    Returns:
+        (largest relative frequency difference, largest relative amplitude
+        difference, passed)
+    """
+    np = numpy()
+    (freqA, ampA) = spectrum(run)
+    (freqB, ampB) = spectrum(ref)
+    resolution = 1.0 / (ref[0][-1] - ref[0][0])
+    scale = np.maximum(ampB.max(axis=0), 1e-12)
+    dfreq = np.where(ampB >= 1e-3 * scale, np.abs(freqA - freqB), 0.0)
+    damp = np.abs(ampA - ampB)
+    passed = bool(((dfreq <= rtol * freqB + resolution) & (damp <= rtol * scale)).all())
+    return (float((dfreq / np.maximum(freqB, resolution)).max()), float((damp / scale).max()), passed)
+
+
+def seriesReport(logdir, refdir, compiler, rtol=1e-6, atol=1e-10, spectral=None, ftol=0.01, timecols=None):
+    """ Compares the time series of every run in logdir with the references in refdir
+
+    RunTests keeps hpts.out as <rea>.hpts.<np> and the keyword lines of the
+    examples in SERIES_CHECK as <rea>.series.<np>.  The references are
+    <file>.<compiler>.npz in refdir; a series without a reference becomes
+    the reference.
+
+    Arguments:
+        logdir (string):  Log directory, e.g. srlLog
+        refdir (string):  Directory of the reference series of that log directory
+        compiler (string):  Compiler of the campaign
+        rtol, atol (float):  Tolerances of the values
+        spectral (list of string):  Sessions whose dominant frequencies and
+            amplitudes are compared instead of their values
+        ftol (float):  Relative tolerance of the frequencies and amplitudes
+        timecols (dict):  {session: position of the time in its keyword
+            lines}, for the sessions that don't print it second (see readSeries)
+    """
+    np = numpy()
+    num_test = 0
+    num_success = 0
+    files = sorted(glob.glob(os.path.join(logdir, '*.hpts.*')) + glob.glob(os.path.join(logdir, '*.series.*')))
+    for runfile in files:
+        run = os.path.basename(runfile)
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        reffile = os.path.join(refdir, '%s.%s.npz' % (run, compiler))
+        timecol = (timecols or {}).get(run.split('.')[0], SERIES_TIME)
+        at = 't = %g' if '.hpts.' in run or timecol else 'line %d'
+        try:
+            series = readHpts(runfile) if '.hpts.' in run else readSeries(runfile, timecol)
+            if not os.path.isfile(reffile):
+                if not os.path.isdir(refdir):
+                    os.makedirs(refdir)
+                np.savez_compressed(reffile, times=series[0], values=series[1])
+                print("[%s] kept as the reference for %s" % (name, compiler))
+                continue
+            with np.load(reffile) as data:
+                ref = (data['times'], data['values'])
+            if run.split('.')[0] in (spectral or []):
+                (dfreq, damp, passed) = compareSpectra(series, ref, ftol)
+                print("[%s] frequency %.2e, amplitude %.2e (tol %.1e)" % (name, dfreq, damp, ftol))
+            else:
+                result = compareSeries(series, ref, rtol, atol)
+                passed = not result['failed'] and not result['missing']
+                print("[%s] %d steps, %d values out of tolerance, max diff %s%s%s" %
+                      (name, result['steps'], result['failed'],
+                       ' '.join(['%.2e' % d for d in result['maxdiff']]),
+                       ', first at ' + at % result['first'] if result['first'] is not None else '',
+                       ', %d steps missing' % result['missing'] if result['missing'] else ''))
+        except ValueError as e:
+            print("[%s] %s" % (name, e))
+            passed = False
+        num_test += 1
+        if passed:
+            num_success += 1
+            print("%s : ." % name)
+        else:
+            print("%s : F " % name)
+    print("\n\nSeries Summary :     %i/%i series checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+# Full logs.  Every line is split into its label (the text with the numbers
+# replaced by '#') and its numbers; lines are matched with the golden log by
+# step, label and their order within the step.  Lines with timing words are
+# not compared, nor the elapsed times at the end of the lines in LOG_TAIL_TIMES
+# (<regex>, <number of trailing times>): the cpu and step time of the 'Step'
+# lines and the solve times of the gmres lines.
+LOG_NUMBER = re.compile(r'(?:(?<![\w.+-])|(?<=\d)(?=[-+]))[-+]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][-+]?\d+)?(?![\w.])')
+LOG_TOKEN = re.compile(LOG_NUMBER.pattern + r'|\n')
+LOG_STEP = re.compile(r'^[ \t]*Step[ \t]+(\d+),', re.MULTILINE)
+LOG_TIMING = re.compile(r'(?i)\btime\b|\btimer?s\b|elapsed|\bcpu\b|\bwall\b|\bdate\b|/s\b|throughput|'
+                        r'\bsec\b|\bseconds?\b|tps|\bdone ::')
+LOG_TAIL_TIMES = ((LOG_STEP, 2), (re.compile(r'gmres:'), 2))
+
+
+def tokenizeLog(filename):
+    """ Splits a log into its lines and their numbers
+
+    The whole text is scanned once by each regex and the line of every
+    match is found from the offsets of the line starts; the timing words
+    are looked for in the distinct labels only.
+
+    Returns:
+        dict of the lines that are compared, in the order of the log:
+        'labels' (list of string), 'steps' (step of the line; lines before
+        the first step are step 0), 'occurrence' (of the step and label
+        before it), 'first' and 'count' (the slice of the line in 'numbers',
+        a flat float64 array)
+    """
+    np = numpy()
+    if filename.endswith('.gz'):
+        with gzip.open(filename, 'rb') as fd:
+            text = fd.read().decode('utf-8', 'replace')
+    else:
+        with open(filename, 'r') as fd:
+            text = fd.read()
+    if text.endswith('\n'):
+        text = text[:-1]
+    lines = [line.strip() for line in LOG_NUMBER.sub('#', text).split('\n')]
+    starts = np.cumsum([0] + [len(line) + 1 for line in text.split('\n')[:-1]])
+
+    def lineOf(regex):
+        return np.searchsorted(starts, [m.start() for m in regex.finditer(text)], side='right') - 1
+
+    # Numbers and line ends in one pass; the numbers of line i follow i line ends
+    tokens = np.array(LOG_TOKEN.findall(text), dtype=np.str_)
+    ends = tokens == '\n'
+    numberLine = np.cumsum(ends)[~ends]
+    strings = tokens[~ends]
+    if 'd' in ''.join(strings.tolist()).lower():
+        strings = np.char.replace(np.char.replace(strings, 'D', 'E'), 'd', 'e')
+    numbers = strings.astype(np.float64)
+
+    count = np.bincount(numberLine, minlength=len(lines))
+    first = np.cumsum(count) - count
+    # Step of every line, from the last Step line before it
+    stepLines = lineOf(LOG_STEP)
+    stepOf = np.zeros(len(lines), dtype=np.int64)
+    stepOf[stepLines] = numbers[first[stepLines]].astype(np.int64)
+    last = np.zeros(len(lines), dtype=np.int64)
+    last[stepLines] = stepLines
+    steps = stepOf[np.maximum.accumulate(last)]
+    # Trailing elapsed times and timing lines
+    tail = np.zeros(len(lines), dtype=np.int64)
+    for (regex, n) in LOG_TAIL_TIMES:
+        tail[lineOf(regex)] = n
+    # Timing words are not numbers: the label of a line tells whether it has some
+    kept = dict([(label, not LOG_TIMING.search(label)) for label in set(lines)])
+    keep = np.array([kept[label] for label in lines], dtype=bool)
+    fromEnd = (first + count)[numberLine] - np.arange(len(numbers)) - 1
+    used = keep[numberLine] & (fromEnd >= tail[numberLine])
+    numbers = numbers[used]
+    count = np.bincount(numberLine[used], minlength=len(lines))[keep]
+    first = np.cumsum(count) - count
+
+    labels = [label for (label, k) in zip(lines, keep.tolist()) if k]
+    steps = steps[keep]
+    seen = collections.defaultdict(int)
+    occurrence = []
+    for key in zip(steps.tolist(), labels):
+        occurrence.append(seen[key])
+        seen[key] += 1
+    return {'labels': labels, 'steps': steps, 'occurrence': np.array(occurrence, dtype=np.int64),
+            'first': first, 'count': count, 'numbers': numbers}
+
+
+def saveTokens(tokens, filename):
+    """ Writes a tokenized log (see tokenizeLog) to a compressed .npz file """
+    np = numpy()
+    tmp = '%s.%d.npz' % (filename[:-4], os.getpid())
+    np.savez_compressed(tmp, labels=np.array(tokens['labels'], dtype=np.str_),
+                        **dict([(k, tokens[k]) for k in ('steps', 'occurrence', 'first', 'count', 'numbers')]))
+    os.rename(tmp, filename)
+
+
+def readTokens(filename):
+    """ Returns the tokenized log of a log file (plain or gzipped) or of a .npz file of saveTokens """
+    np = numpy()
+    if not filename.endswith('.npz'):
+        return tokenizeLog(filename)
+    with np.load(filename) as data:
+        tokens = dict([(k, data[k]) for k in ('steps', 'occurrence', 'first', 'count', 'numbers')])
+        tokens['labels'] = data['labels'].tolist()
+    return tokens
+
+
+def diffLogs(runlog, goldenlog, rtol=1e-6, atol=1e-12, top=5):
+    """ Compares every number of a log with the matching number of a golden log
+
+    Either log is a log file or a tokenized log (see readTokens).
+
+    Returns:
+        dict with 'compared' (numbers), 'failed' (numbers out of tolerance),
+        'first' (first step with a number out of tolerance, or None),
+        'missing' and 'extra' (lines only in the golden log or only in the
+        run log) and 'worst', [(relative deviation, step, label, run value,
+        golden value)] of the top largest deviations
+    """
+    np = numpy()
+    run = readTokens(runlog) if isinstance(runlog, str) else runlog
+    gold = readTokens(goldenlog) if isinstance(goldenlog, str) else goldenlog
+    goldLine = dict(zip(zip(gold['steps'].tolist(), gold['labels'], gold['occurrence'].tolist()),
+                        range(len(gold['labels']))))
+    match = np.array([goldLine.get(key, -1) for key in
+                      zip(run['steps'].tolist(), run['labels'], run['occurrence'].tolist())], dtype=np.int64)
+    found = match >= 0
+    result = {'missing': len(gold['labels']) - int(found.sum()), 'extra': int((~found).sum()),
+              'compared': 0, 'failed': 0, 'first': None, 'worst': []}
+    # Lines matched with the same count of numbers, and the positions of their numbers
+    runLines = np.nonzero(found)[0]
+    goldLines = match[found]
+    same = (run['count'][runLines] == gold['count'][goldLines]) & (run['count'][runLines] > 0)
+    (runLines, goldLines) = (runLines[same], goldLines[same])
+    counts = run['count'][runLines]
+    if not counts.sum():
+        return result
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    runIdx = np.repeat(run['first'][runLines], counts) + offsets
+    goldIdx = np.repeat(gold['first'][goldLines], counts) + offsets
+    a = run['numbers'][runIdx]
+    b = gold['numbers'][goldIdx]
+    diff = np.abs(a - b)
+    bad = ~(diff <= atol + rtol * np.abs(b))
+    rel = diff / np.maximum(np.abs(b), atol)
+    result['compared'] = len(a)
+    result['failed'] = int(bad.sum())
+    if result['failed']:
+        lineOf = np.repeat(goldLines, counts)
+        result['first'] = int(gold['steps'][lineOf[bad]].min())
+        worst = np.nonzero(bad)[0]
+        worst = worst[np.argsort(-rel[worst], kind='mergesort')[:top]]
+        result['worst'] = [(float(rel[i]), int(gold['steps'][lineOf[i]]), gold['labels'][lineOf[i]],
+                            float(a[i]), float(b[i])) for i in worst]
+    return result
+
+
+def logReport(logdir, refdir, compiler, sessions=None, rtol=1e-6, atol=1e-12, top=5):
+    """ Compares the logs of the runs in logdir with their golden logs in refdir
+
+    The golden log of a run is kept tokenized, as <log>.<compiler>.npz in
+    refdir (see saveTokens); a log without one becomes the golden log.
+
+    Arguments:
+        logdir (string):  Log directory, e.g. srlLog
+        refdir (string):  Directory of the golden logs of that log directory
+        compiler (string):  Compiler of the campaign
+        sessions (list of string):  Sessions to compare; all if empty
+        rtol, atol (float):  Tolerances of the numbers
+        top (int):  Number of the largest deviations reported
+    """
+    num_test = 0
+    num_success = 0
+    for logfile in sorted(glob.glob(os.path.join(logdir, '*.log.*'))):
+        run = os.path.basename(logfile)
+        if not re.search(r'\.log\.\d+$', run) or (sessions and run.split('.')[0] not in sessions):
+            continue
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        golden = os.path.join(refdir, '%s.%s.npz' % (run, compiler))
+        if not os.path.isfile(golden):
+            if not os.path.isdir(refdir):
+                os.makedirs(refdir)
+            # Golden logs kept as gzipped text are tokenized once
+            old = golden[:-4] + '.gz'
+            saveTokens(tokenizeLog(old if os.path.isfile(old) else logfile), golden)
+            if os.path.isfile(old):
+                os.remove(old)
+            else:
+                print("[%s] kept as the golden log for %s" % (name, compiler))
+                continue
+        result = diffLogs(logfile, golden, rtol, atol, top)
+        print("[%s] %d numbers, %d out of tolerance, %d lines missing, %d extra%s" %
+              (name, result['compared'], result['failed'], result['missing'], result['extra'],
+               ', first at step %d' % result['first'] if result['first'] is not None else ''))
+        for (rel, step, label, a, b) in result['worst']:
+            print("[%s]     step %d: %.6e vs %.6e (%.1e) in '%s'" % (name, step, a, b, rel, label[:60]))
+        num_test += 1
+        if result['failed'] or not result['compared']:
+            print("%s : F " % name)
+        else:
+            num_success += 1
+            print("%s : ." % name)
+    print("\n\nLog Summary :     %i/%i log checks were successful" % (num_success, num_test))
+
+
+
+def logSelfTest(steps=1000, budget=0.5):
+    """ Times the log diff of a synthetic nek log against its tokenized golden log
+
+    The run log has other timings everywhere and diverges at 3/5 of the
+    steps; the diff must find that step and only that, within budget seconds.
+    It tests the checker, not a run, so it is run by hand, not by RunTests.
+
+    Returns:
+        True if the diff is right and fast enough
+    """
+    import tempfile
+
+    def write(filename, diverge, seed):
+        out = []
+        out.append('   Nek5000 self test log, date 2026-01-01')
+        for i in range(1, 11):
+            out.append('  %d  %.14E  %.14E  %.14E' % (i, 0.1 * i, 0.2 * i, -0.3 * i))
+        for step in range(1, steps + 1):
+            d = 1e-3 if step >= diverge else 0.0
+            t = (step % 97 + seed) * 1.37e-2
+            out.append('Step %6d, t= %.7E, DT= 1.0000000E-03, C=  0.016 %.4E %.4E' % (step, 1e-3 * step, t, t / step))
+            out.append('             Solving for fluid           F   F   T')
+            for (k, what) in enumerate(('Hmholtz VELX', 'Hmholtz VELY', 'Hmholtz VELZ')):
+                out.append('%11d  %s: %4d  %.4E  %.4E  1.0000E-08' % (step, what, 5 + k, 1.1e-9 * (k + 1), 2.2e-2 * step))
+            for k in range(3):
+                out.append('%11d  U-PRES gmres: %4d  %.4E  %.4E  %.4E  %.4E  %.4E' %
+                           (step, 30 + k, 9.1e-5, 3.3e-3 * (1 + d), 1e-4, t, t * 2))
+            out.append('%11d  DNORM, DIVEX  %.17E  %.17E' % (step, 1.5e-3 * (1 + d), 2.5e-6))
+            out.append('%11d  Fluid done %.4E' % (step, 1e-3 * step))
+            out.append('        %d %.14E %.14E %.14E %.14E %.14E' % (step, 1e-3 * step, 0.5 + d, 0.25, -0.125, 1.0 / step))
+            out.append(' L1/L2 DIV(V)        %.14E  %.14E' % (1e-12 * step, 2e-12))
+        out.append('   total elapsed time        %.4E sec' % (seed * 12.3))
+        with open(filename, 'w') as fd:
+            fd.write('\n'.join(out) + '\n')
+
+    tmp = tempfile.mkdtemp()
+    try:
+        (runlog, goldlog) = (os.path.join(tmp, 'run.log.1'), os.path.join(tmp, 'gold.log.1'))
+        write(goldlog, steps + 1, 0)
+        saveTokens(tokenizeLog(goldlog), goldlog + '.npz')
+        diverge = steps * 3 // 5
+        write(runlog, diverge, 1)
+        start = time.time()
+        result = diffLogs(runlog, goldlog + '.npz')
+        elapsed = time.time() - start
+    finally:
+        shutil.rmtree(tmp)
+    print("%d steps, %d numbers: diff in %.3f s (budget %.3f s), first out of tolerance at step %s" %
+          (steps, result['compared'], elapsed, budget, result['first']))
+    ok = result['first'] == diverge and not result['missing'] and not result['extra'] and elapsed < budget
+    print("log self test : %s" % ('.' if ok else 'F'))
+    return ok
+
+###############################################################################
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Numerical checks of the nek output")
+    commands = parser.add_subparsers(dest='command')
+
+    cmd = commands.add_parser('fields', help="compare the final fields of every run with references")
+    cmd.add_argument('logdir')
+    cmd.add_argument('--ref', required=True, help="reference store of logdir")
+    cmd.add_argument('--compiler', required=True)
+    cmd.add_argument('--tol', nargs='*', help="tolerances like U=1e-6 P=1e-4 all=1e-5 (default %g)" % FIELD_TOL)
+    cmd.add_argument('--chunk', type=int, default=4096, help="elements compared at a time")
+
+    cmd = commands.add_parser('refs', help="list the references of a reference store and their sizes")
+    cmd.add_argument('refdir')
+
+    cmd = commands.add_parser('ref-get', help="print an element range of a stored reference field")
+    cmd.add_argument('refdir')
+    cmd.add_argument('run')
+    cmd.add_argument('field')
+    cmd.add_argument('--compiler', help="default: the base compiler")
+    cmd.add_argument('--elements', default='0:1', help="range start:stop of element positions")
+
+    cmd = commands.add_parser('field-info', help="print the header of a binary field file")
+    cmd.add_argument('file')
+
+    cmd = commands.add_parser('series', help="compare the history points and keyword series with references")
+    cmd.add_argument('logdir')
+    cmd.add_argument('--ref', required=True, help="directory of the reference series of logdir")
+    cmd.add_argument('--compiler', required=True)
+    cmd.add_argument('--rtol', type=float, default=1e-6)
+    cmd.add_argument('--atol', type=float, default=1e-10)
+    cmd.add_argument('--spectral', nargs='*', help="sessions compared by dominant frequency and amplitude")
+    cmd.add_argument('--ftol', type=float, default=0.01, help="relative tolerance of the spectral comparison")
+    cmd.add_argument('--time-col', nargs='*', dest='timecols',
+                     help="position of the time in the keyword lines of a session, e.g. st1=1 (default 2, 0: none)")
+
+    cmd = commands.add_parser('logs', help="compare every number of the logs with golden logs")
+    cmd.add_argument('logdir')
+    cmd.add_argument('--ref', required=True, help="directory of the golden logs of logdir")
+    cmd.add_argument('--compiler', required=True)
+    cmd.add_argument('--sessions', nargs='*', help="sessions to compare (default: all)")
+    cmd.add_argument('--rtol', type=float, default=1e-6)
+    cmd.add_argument('--atol', type=float, default=1e-12)
+    cmd.add_argument('--top', type=int, default=5, help="largest deviations reported")
+
+    cmd = commands.add_parser('log-diff', help="compare every number of a log with a golden log")
+    cmd.add_argument('log')
+    cmd.add_argument('golden')
+    cmd.add_argument('--rtol', type=float, default=1e-6)
+    cmd.add_argument('--atol', type=float, default=1e-12)
+    cmd.add_argument('--top', type=int, default=10, help="largest deviations reported")
+
+    cmd = commands.add_parser('log-selftest', help="time the log diff on a synthetic log")
+    cmd.add_argument('--steps', type=int, default=1000)
+    cmd.add_argument('--budget', type=float, default=0.5, help="seconds allowed for the diff")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'fields':
+            fieldReport(args.logdir, args.ref, args.compiler, parseTolerances(args.tol), args.chunk)
+        elif args.command == 'refs':
+            storeReport(args.refdir)
+        elif args.command == 'ref-get':
+            store = ReferenceStore(args.refdir)
+            meta = store.store(args.run) or {}
+            (start, stop) = [int(e) for e in args.elements.split(':')]
+            values = store.reader(args.run, args.compiler or meta.get('base'))(args.field, start, stop)
+            for (e, element) in enumerate(values):
+                for (c, points) in enumerate(element):
+                    print("element %d component %d: %s" % (start + e, c, ' '.join(['%.6e' % v for v in points])))
+        elif args.command == 'field-info':
+            f = FieldFile(args.file)
+            print("%s: %d of %d elements, %dx%dx%d points, %d-byte %s values, step %d, time %g" %
+                  (f.filename, f.nelt, f.nelgt, f.lx, f.ly, f.lz, f.wdsize,
+                   'big-endian' if f.byteorder == '>' else 'little-endian', f.istep, f.time))
+            print("fields: %s" % ' '.join(f.fields))
+        elif args.command == 'series':
+            seriesReport(args.logdir, args.ref, args.compiler, args.rtol, args.atol, args.spectral, args.ftol,
+                         parseColumns(args.timecols))
+        elif args.command == 'logs':
+            logReport(args.logdir, args.ref, args.compiler, args.sessions, args.rtol, args.atol, args.top)
+        elif args.command == 'log-diff':
+            result = diffLogs(args.log, args.golden, args.rtol, args.atol, args.top)
+            print("%d numbers, %d out of tolerance, %d lines missing, %d extra%s" %
+                  (result['compared'], result['failed'], result['missing'], result['extra'],
+                   ', first at step %d' % result['first'] if result['first'] is not None else ''))
+            for (rel, step, label, a, b) in result['worst']:
+                print("    step %d: %.6e vs %.6e (%.1e) in '%s'" % (step, a, b, rel, label))
+            sys.exit(1 if result['failed'] else 0)
+        elif args.command == 'log-selftest':
+            sys.exit(0 if logSelfTest(args.steps, args.budget) else 1)
+        else:
+            parser.print_help()
+            sys.exit(1)
+    except (ImportError, ValueError) as e:
+        sys.stderr.write("NekCheck.py: %s\n" % e)
+        sys.exit(1)
@@ -0,0 +1,2436 @@
+#! /usr/bin/python
+# Python module with performance tools for the Nek tests
+
+import argparse
+import ast
+import collections
+import glob
+import json
+import math
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+
+###############################################################################
+def findValue(logfile, keyword, col, last=True):
+    """ Returns a value from a logfile, using the same convention as Analysis.py
+
+    Arguments:
+        logfile (string):  Path to the logfile
+        keyword (string):  Word or phrase that identifies the line
+        col (int):  The column (from the right) where the value appears
+        last (bool):  If True, return the value on the last matching line,
+            otherwise return the first one
+
+    Returns:
+        The value as a float, or None if the logfile or the value is missing
+    """
+    value = None
+    try:
+        with open(logfile, 'r') as fd:
+            for line in fd:
+                if keyword in line:
+                    try:
+                        value = float(line.split()[-col])
+                    except (ValueError, IndexError):
+                        continue
+                    if not last:
+                        break
+    except IOError:
+        return None
+    return value
+
+
+def findValues(logfile, keyword, col):
+    """ Returns the values on every line of a logfile that contains keyword
+
+    Same convention as findValue(); lines that can't be parsed are skipped.
+    Returns an empty list if the logfile is missing.
+    """
+    values = []
+    try:
+        with open(logfile, 'r') as fd:
+            for line in fd:
+                if keyword in line:
+                    try:
+                        values.append(float(line.split()[-col]))
+                    except (ValueError, IndexError):
+                        pass
+    except IOError:
+        pass
+    return values
+
+
+def findMatches(logfile, pattern):
+    """ Returns the groups of every match of a regular expression in a logfile
+
+    Arguments:
+        logfile (string):  Path to the logfile
+        pattern (string):  Regular expression, matched with re.search on every line
+
+    Returns:
+        List of the match.groups() tuples; empty if the logfile is missing
+    """
+    regex = re.compile(pattern)
+    matches = []
+    try:
+        with open(logfile, 'r') as fd:
+            for line in fd:
+                match = regex.search(line)
+                if match:
+                    matches.append(match.groups())
+    except IOError:
+        pass
+    return matches
+
+
+def solverTime(logfile):
+    """ Returns the 'total solver time' reported in a logfile, or None """
+    return findValue(logfile, 'total solver time', 2)
+
+
+###############################################################################
+def mean(values):
+    """ Returns the arithmetic mean of a list of numbers """
+    return sum(values) / float(len(values))
+
+
+def correlation(xs, ys):
+    """ Returns the Pearson correlation coefficient of two lists of numbers
+
+    Returns None if there are fewer than three pairs or if one of the lists is constant.
+    """
+    if len(xs) != len(ys) or len(xs) < 3:
+        return None
+    mx = mean(xs)
+    my = mean(ys)
+    sxy = sum([(x - mx) * (y - my) for (x, y) in zip(xs, ys)])
+    sxx = sum([(x - mx) ** 2 for x in xs])
+    syy = sum([(y - my) ** 2 for y in ys])
+    if sxx == 0.0 or syy == 0.0:
+        return None
+    return sxy / math.sqrt(sxx * syy)
+
+
+def median(values):
+    """ Returns the median of a list of numbers """
+    ordered = sorted(values)
+    n = len(ordered)
+    if n % 2:
+        return ordered[n // 2]
+    return 0.5 * (ordered[n // 2 - 1] + ordered[n // 2])
+
+
+###############################################################################
+def campaignInfo(infofile='campaign.info'):
+    """ Reads the campaign.info file that RunTests writes
+
+    Returns:
+        dict with at least 'campaign', 'revision' and 'compiler'.  If the file
+        is missing, the campaign is named after the current time.  If the
+        calibration of the node was run, 'speed' is its speed (see machineSpeed).
+    """
+    info = {}
+    try:
+        with open(infofile, 'r') as fd:
+            for line in fd:
+                cols = line.split(None, 1)
+                if len(cols) == 2:
+                    info[cols[0]] = cols[1].strip()
+    except IOError:
+        pass
+    info.setdefault('campaign', time.strftime('%Y%m%d%H%M%S'))
+    info.setdefault('revision', 'unknown')
+    info.setdefault('compiler', os.environ.get('COMPILER', 'unknown'))
+    speed = machineSpeed(info)
+    if speed:
+        info['speed'] = speed
+    return info
+
+
+def machineSpeed(info):
+    """ Returns the speed of the node from the calibration in campaign.info, or None
+
+    The speed is the geometric mean of the memory bandwidth (MB/s) and the
+    mxm rate (MFLOP/s) that NekCalib measured, so that timings of campaigns
+    on different or differently loaded nodes can be compared.
+    """
+    try:
+        return math.sqrt(float(info['bandwidth']) * float(info['mxm']))
+    except (KeyError, ValueError):
+        return None
+
+
+def timingTrusted(info):
+    """ Returns False, with a notice, if RunTests found the node too loaded for timing checks """
+    if info.get('timing') == 'off':
+        print("Timing checks skipped: the node was not quiet (load %s)" % info.get('load', '?'))
+        return False
+    return True
+
+
+def profiled(info, run):
+    """ Returns True, with a notice, if a run was profiled (HEAPPROF or GPROF in RunTests)
+
+    Rank 0 of a heap profiled run is valgrind, which makes the run many
+    times slower, and a gprof run is built with -pg, which slows every
+    call down, so their timings are not checked or added to the history.
+
+    Arguments:
+        info (dict):  Campaign description from campaignInfo
+        run (string):  Log name of the run, e.g. eddy_uv.log.1
+    """
+    session = run.split('.')[0]
+    if session in info.get('heapprof', '').split():
+        print("[%s]...heap profiled under valgrind; timing checks skipped" % run)
+        return True
+    if session in info.get('gprof', '').split():
+        print("[%s]...profiled with gprof; timing checks skipped" % run)
+        return True
+    return False
+
+
+def historyFile(compiler):
+    """ Returns the path of the history file of a compiler
+
+    History files live in $NEK_HISTORY_DIR, by default tests/history.
+    """
+    histdir = os.environ.get('NEK_HISTORY_DIR',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history'))
+    return os.path.join(histdir, '%s.json' % compiler)
+
+
+class History(object):
+    """ Performance history of one compiler
+
+    The history is a file with one JSON record per line, so that campaigns
+    only ever append to it.  Every record is one value of one metric:
+
+        {"campaign": ..., "revision": ..., "logdir": "srlLog", "run": "eddy_uv.log.1",
+         "metric": "solve time", "value": 12.3, "speed": 8100.0}
+
+    "speed" is the calibrated speed of the node, if known; timings of other
+    campaigns are scaled by it before they are compared.
+
+    Attributes:
+        filename (string):  Path of the history file
+        records (list of dict):  Records read from the file or added since
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.records = []
+        self._new = []
+        try:
+            with open(filename, 'r') as fd:
+                for line in fd:
+                    if line.strip():
+                        self.records.append(json.loads(line))
+        except IOError:
+            pass
+
+    def add(self, info, logdir, run, metric, value):
+        """ Adds the value of a metric for a run of the campaign described by info """
+        record = {'campaign': info['campaign'], 'revision': info['revision'],
+                  'logdir': os.path.basename(os.path.normpath(logdir)), 'run': run,
+                  'metric': metric, 'value': value}
+        if 'speed' in info:
+            record['speed'] = info['speed']
+        self.records.append(record)
+        self._new.append(record)
+
+    def save(self):
+        """ Appends the records added since the file was read """
+        if not self._new:
+            return
+        histdir = os.path.dirname(self.filename)
+        if histdir and not os.path.isdir(histdir):
+            os.makedirs(histdir)
+        with open(self.filename, 'a') as fd:
+            for record in self._new:
+                fd.write(json.dumps(record, sort_keys=True) + '\n')
+        self._new = []
+
+    def values(self, logdir, run, metric, exclude=None, speed=None):
+        """ Returns [(campaign, value)] of a metric, oldest campaign first
+
+        Arguments:
+            logdir, run, metric (string):  What to look up
+            exclude (string):  Campaign to leave out, normally the current one
+            speed (float):  Speed of the current node; timings recorded with
+                            a speed are scaled to it
+        """
+        logdir = os.path.basename(os.path.normpath(logdir))
+        found = collections.OrderedDict()
+        for r in self.records:
+            if (r['logdir'] == logdir and r['run'] == run and r['metric'] == metric
+                    and r['campaign'] != exclude):
+                value = r['value']
+                if speed and r.get('speed'):
+                    value = value * r['speed'] / speed
+                found[r['campaign']] = value
+        return sorted(found.items())
+
+    def baseline(self, logdir, run, metric, exclude=None, last=5, speed=None):
+        """ Returns the median of a metric over the last campaigns, or None
+
+        For timings, pass the speed of the current node (see values).
+        """
+        values = [v for (c, v) in self.values(logdir, run, metric, exclude, speed)[-last:]]
+        if not values:
+            return None
+        return median(values)
+
+    def spread(self, logdir, run, metric, exclude=None, last=5, speed=None):
+        """ Returns the median absolute deviation of a metric over the last campaigns
+
+        Returns 0.0 with fewer than 3 campaigns, where it can't be told.
+        """
+        values = [v for (c, v) in self.values(logdir, run, metric, exclude, speed)[-last:]]
+        if len(values) < 3:
+            return 0.0
+        center = median(values)
+        return median([abs(v - center) for v in values])
+
+
+def exceeds(value, baseline, rel, floor=0.0):
+    """ Returns True if value exceeds baseline by more than a fraction rel and by more than floor """
+    if baseline is None:
+        return False
+    return value - baseline > rel * baseline and value - baseline > floor
+
+
+def historyCheck(name, metric, value, baseline, rel, floor=0.0):
+    """ Checks a value against its history baseline and prints the result like Analysis.py
+
+    The check fails if value exceeds the baseline by more than a fraction rel
+    and by more than floor (so that tiny timings don't fail on noise).
+
+    Returns:
+        True if the check passed or there is no baseline yet
+    """
+    if baseline is None:
+        print("[%s] %s : %.4g (no history yet)" % (name, metric, value))
+        return True
+    print("[%s] %s : %.4g (baseline %.4g, %+.1f%%)" %
+          (name, metric, value, baseline, 100.0 * (value - baseline) / baseline if baseline else 0.0))
+    return not exceeds(value, baseline, rel, floor)
+
+
+###############################################################################
+# Faces of an element, as positions in the vertex list of a .map file.
+# genmap writes the vertices in tensor-product ordering.
+MAP_FACES = {4: ((0, 1), (1, 3), (2, 3), (0, 2)),
+             8: ((0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 4, 5),
+                 (2, 3, 6, 7), (0, 2, 4, 6), (1, 3, 5, 7))}
+
+
+def readMap(mapfile):
+    """ Reads a .map file written by genmap
+
+    Arguments:
+        mapfile (string):  Path to the .map file
+
+    Returns:
+        (pmap, vertices), where pmap is the list of partition ids (first column)
+        and vertices is the list of vertex-id tuples, one per element
+    """
+    pmap = []
+    vertices = []
+    with open(mapfile, 'r') as fd:
+        header = fd.readline().split()
+        nel = int(header[0])
+        for line in fd:
+            cols = [int(c) for c in line.split()]
+            if not cols:
+                continue
+            pmap.append(cols[0])
+            vertices.append(tuple(cols[1:]))
+            if len(pmap) == nel:
+                break
+    return pmap, vertices
+
+
+def partitionStats(mapfile, nranks):
+    """ Computes the quality of the partition that nek builds from a .map file
+
+    nek sorts the elements by their partition id and deals them out in
+    contiguous blocks, the first (nel % nranks) ranks getting one extra element.
+
+    Arguments:
+        mapfile (string):  Path to the .map file
+        nranks (int):  Number of MPI ranks
+
+    Returns:
+        dict with the element counts per rank ('elements'), the load imbalance
+        (max/mean), the number of faces shared between ranks ('cutFaces'),
+        the largest number of shared faces on one rank ('maxRankFaces') and the
+        largest number of neighbor ranks of one rank ('maxNeighbors')
+    """
+    pmap, vertices = readMap(mapfile)
+    nel = len(pmap)
+    order = sorted(range(nel), key=lambda e: pmap[e])
+    owner = [0] * nel
+    elements = []
+    start = 0
+    for rank in range(nranks):
+        count = nel // nranks + (1 if rank < nel % nranks else 0)
+        for e in order[start:start + count]:
+            owner[e] = rank
+        elements.append(count)
+        start += count
+
+    faces = {}
+    for (e, verts) in enumerate(vertices):
+        for face in MAP_FACES.get(len(verts), ()):
+            key = frozenset([verts[i] for i in face])
+            faces.setdefault(key, []).append(e)
+
+    cutFaces = 0
+    rankFaces = [0] * nranks
+    neighbors = [set() for rank in range(nranks)]
+    for elems in faces.values():
+        if len(elems) != 2:
+            continue
+        (r1, r2) = (owner[elems[0]], owner[elems[1]])
+        if r1 != r2:
+            cutFaces += 1
+            rankFaces[r1] += 1
+            rankFaces[r2] += 1
+            neighbors[r1].add(r2)
+            neighbors[r2].add(r1)
+
+    return {'nel': nel,
+            'elements': elements,
+            'imbalance': max(elements) / (float(nel) / nranks) if nel else 0.0,
+            'cutFaces': cutFaces,
+            'maxRankFaces': max(rankFaces),
+            'maxNeighbors': max([len(n) for n in neighbors])}
+
+
+def genmapReport(logdir, nranks):
+    """ Prints partition quality vs. solver time for a genmap benchmark
+
+    RunTests (with GENMAP_TOLS set) leaves <rea>.map.gm<tol> and <rea>.log.<nranks>.gm<tol>
+    for every tolerance in logdir.
+
+    Arguments:
+        logdir (string):  Directory with the maps and logs, e.g. ./mpiLog
+        nranks (int):  Number of ranks the logs were run with
+    """
+    runs = {}
+    for mapfile in sorted(glob.glob(os.path.join(logdir, '*.map.gm*'))):
+        (rea, tol) = re.match(r'(.*)\.map\.gm(.*)$', os.path.basename(mapfile)).groups()
+        logfile = os.path.join(logdir, '%s.log.%d.gm%s' % (rea, nranks, tol))
+        stats = partitionStats(mapfile, nranks)
+        stats['tol'] = tol
+        stats['time'] = solverTime(logfile)
+        runs.setdefault(rea, []).append(stats)
+
+    if not runs:
+        print("No genmap benchmark results found in %s" % logdir)
+        return
+
+    print("%-16s %8s %6s %9s %9s %9s %6s %12s" %
+          ('example', 'tol', 'nel', 'imbalance', 'cutFaces', 'maxFaces', 'nbrs', 'solver time'))
+    allCut, allImb, allTime = [], [], []
+    for rea in sorted(runs):
+        for s in runs[rea]:
+            print("%-16s %8s %6d %9.3f %9d %9d %6d %12s" %
+                  (rea, s['tol'], s['nel'], s['imbalance'], s['cutFaces'],
+                   s['maxRankFaces'], s['maxNeighbors'],
+                   '-' if s['time'] is None else '%.4e' % s['time']))
+        timed = [s for s in runs[rea] if s['time'] is not None]
+        if len(timed) < 2:
+            continue
+        # Normalize per example so that examples can be pooled
+        tmean = mean([s['time'] for s in timed])
+        cmean = mean([s['cutFaces'] for s in timed]) or 1.0
+        for s in timed:
+            allTime.append(s['time'] / tmean)
+            allCut.append(s['cutFaces'] / cmean)
+            allImb.append(s['imbalance'])
+        r = correlation([s['maxRankFaces'] for s in timed], [s['time'] for s in timed])
+        if r is not None:
+            print("[%s] correlation(maxFaces, solver time) : %.3f" % (rea, r))
+
+    print("")
+    r = correlation(allCut, allTime)
+    print("Campaign correlation(cutFaces, solver time)  : %s" % ('-' if r is None else '%.3f' % r))
+    r = correlation(allImb, allTime)
+    print("Campaign correlation(imbalance, solver time) : %s" % ('-' if r is None else '%.3f' % r))
+
+
+###############################################################################
+FLOAT = r'([-+]?\d*\.?\d+(?:[eEdD][-+]?\d+)?)'
+
+
+def pressureIterKey(logdir):
+    """ Returns the [keyword, col] of the eddy pressure iterations for a log directory
+
+    The column of the 'gmres:' iteration count differs between the Pn-Pn
+    (mpiLog, srlLog) and the Pn-Pn-2 (mpi2Log, srl2Log) logs.
+    """
+    if '2Log' in os.path.basename(os.path.normpath(logdir)):
+        return ['gmres: ', 6]
+    return ['gmres: ', 7]
+
+
+def coarseStats(logfile, iterKey):
+    """ Extracts coarse-grid solver statistics from a logfile
+
+    Arguments:
+        logfile (string):  Path to the logfile
+        iterKey (list):  [keyword, col] of the pressure iteration count
+
+    Returns:
+        dict with the coarse-grid setup time ('setup'), the number of coarse
+        solves and their total and average time ('ncrsl', 'tcrsl', 'perSolve'),
+        the total and average pressure iterations and the solver time.
+        Values that are missing from the logfile are None.
+    """
+    setup = findMatches(logfile, r'done :: setup h1 coarse grid.*?' + FLOAT + r'\s*sec')
+    crsl = findMatches(logfile, r'crsl time\s+(\d+)\s+' + FLOAT)
+    iters = findValues(logfile, iterKey[0], iterKey[1])
+
+    stats = {'setup': float(setup[-1][0].replace('D', 'E')) if setup else None,
+             'ncrsl': None, 'tcrsl': None, 'perSolve': None,
+             'iters': sum(iters) if iters else None,
+             'avgIters': mean(iters) if iters else None,
+             'time': solverTime(logfile)}
+    if crsl:
+        stats['ncrsl'] = int(crsl[-1][0])
+        stats['tcrsl'] = float(crsl[-1][1].replace('D', 'E'))
+        if stats['ncrsl'] > 0:
+            stats['perSolve'] = stats['tcrsl'] / stats['ncrsl']
+    return stats
+
+
+def coarseReport(logdir, rea='amg_eddy'):
+    """ Prints the XXT vs. AMG coarse-grid solver comparison
+
+    RunTests (with COARSE_BENCH=on) leaves <rea>.log.<np>.xxt and <rea>.log.<np>.amg
+    for every rank count in logdir.
+
+    Arguments:
+        logdir (string):  Directory with the logs, e.g. ./mpiLog
+        rea (string):  Name of the benchmarked case
+    """
+    iterKey = pressureIterKey(logdir)
+    ranks = set()
+    for logfile in glob.glob(os.path.join(logdir, '%s.log.*.*' % rea)):
+        match = re.match(r'.*\.log\.(\d+)\.(xxt|amg)$', logfile)
+        if match:
+            ranks.add(int(match.group(1)))
+    if not ranks:
+        print("No coarse solver benchmark results found in %s" % logdir)
+        return
+
+    def fmt(value, spec='%.3e'):
+        return '-' if value is None else spec % value
+
+    print("%-6s %-4s %10s %7s %10s %10s %10s %12s" %
+          ('ranks', 'crs', 'setup', 'ncrsl', 'per solve', 'iters', 'avg iters', 'solver time'))
+    for np in sorted(ranks):
+        stats = {}
+        for crs in ('xxt', 'amg'):
+            logfile = os.path.join(logdir, '%s.log.%d.%s' % (rea, np, crs))
+            stats[crs] = coarseStats(logfile, iterKey)
+            s = stats[crs]
+            print("%-6d %-4s %10s %7s %10s %10s %10s %12s" %
+                  (np, crs.upper(), fmt(s['setup']), fmt(s['ncrsl'], '%d'), fmt(s['perSolve']),
+                   fmt(s['iters'], '%d'), fmt(s['avgIters'], '%.1f'), fmt(s['time'])))
+
+        # Compare total coarse-grid cost if nek printed it, otherwise the solver time
+        cost = {}
+        for crs in ('xxt', 'amg'):
+            s = stats[crs]
+            if s['setup'] is not None and s['tcrsl'] is not None:
+                cost[crs] = s['setup'] + s['tcrsl']
+            else:
+                cost[crs] = s['time']
+        if cost['xxt'] is None or cost['amg'] is None:
+            print("[%s] %d ranks : winner unknown, missing timings" % (rea, np))
+        else:
+            winner = 'XXT' if cost['xxt'] <= cost['amg'] else 'AMG'
+            print("[%s] %d ranks : %s wins (XXT %.3e, AMG %.3e)" % (rea, np, winner, cost['xxt'], cost['amg']))
+        print("")
+
+
+###############################################################################
+# Totals of the per-rank values written by NekWrap.py
+USAGE_SUMS = ('user cpu (s)', 'sys cpu (s)', 'voluntary ctx switches', 'involuntary ctx switches',
+              'major page faults', 'minor page faults')
+
+
+def readUsage(filename):
+    """ Reads a per-rank resource usage file written by NekWrap.py
+
+    Returns:
+        OrderedDict of {name: value}, where values are floats
+    """
+    usage = collections.OrderedDict()
+    with open(filename, 'r') as fd:
+        for line in fd:
+            cols = line.split()
+            if len(cols) < 2:
+                continue
+            try:
+                usage[' '.join(cols[:-1])] = float(cols[-1])
+            except ValueError:
+                pass
+    return usage
+
+
+def buildUsage(logdir, session):
+    """ Reads the build file of the binary that a session ran
+
+    Arguments:
+        logdir (string):  Directory with the <case>.build files
+        session (string):  Session name, with the NEK_RUN_TAG if any
+
+    Returns:
+        OrderedDict of {name: value} of <case>.build.<tag>, or of <case>.build
+        if the run has no build of its own; empty if neither exists
+    """
+    (case, _, tag) = session.partition('.')
+    names = [case + '.build']
+    if tag:
+        names.insert(0, '%s.build.%s' % (case, tag))
+    for name in names:
+        path = os.path.join(logdir, name)
+        if os.path.exists(path):
+            return readUsage(path)
+    return collections.OrderedDict()
+
+
+def mergeUsage(logdir):
+    """ Merges the per-rank resource usage files of every run in logdir
+
+    Each set of <session>.rusage.<np>.<rank> files is replaced by one
+    <session>.rusage.<np> file with the totals and maxima over the ranks, the
+    size of the static arrays of the binary (from the <case>.build file of
+    build_nek) and the ratio of the peak RSS to it.  The per-rank values are
+    kept at the end of the file.
+
+    Arguments:
+        logdir (string):  Directory with the usage files, e.g. ./mpiLog
+    """
+    runs = {}
+    for filename in glob.glob(os.path.join(logdir, '*.rusage.*.*')):
+        match = re.match(r'(.*\.rusage\.\d+)\.(\d+)$', filename)
+        if match:
+            runs.setdefault(match.group(1), {})[int(match.group(2))] = filename
+
+    for (merged, parts) in sorted(runs.items()):
+        ranks = [readUsage(parts[r]) for r in sorted(parts)]
+        first = ranks[0]
+        session = os.path.basename(merged).rsplit('.rusage.', 1)[0]
+        for (name, value) in buildUsage(logdir, session).items():
+            if name.startswith('binary'):
+                first[name] = value
+        rss = [u.get('peak rss (kB)', 0.0) for u in ranks]
+        lines = [("ranks", len(ranks)),
+                 ("exit status max", max([u.get('exit status', 0.0) for u in ranks])),
+                 ("peak rss max (kB)", max(rss)),
+                 ("peak rss sum (kB)", sum(rss))]
+        for name in USAGE_SUMS:
+            lines.append((name, sum([u.get(name, 0.0) for u in ranks])))
+
+        if 'binary bss (kB)' in first:
+            static = first.get('binary data (kB)', 0.0) + first['binary bss (kB)']
+            lines.append(("static data+bss (kB)", static))
+            if static > 0:
+                lines.append(("rss/static ratio", max(rss) / static))
+            npts = 1
+            for name in ('SIZE lx1', 'SIZE ly1', 'SIZE lz1', 'SIZE lelt'):
+                npts *= int(first.get(name, 1))
+            if 'SIZE lelt' in first:
+                lines.append(("SIZE gridpoints per rank", npts))
+                lines.append(("static bytes per gridpoint", static * 1024.0 / npts))
+
+        with open(merged, 'w') as fd:
+            for (name, value) in lines:
+                if value == int(value):
+                    fd.write("%-28s %d\n" % (name, value))
+                else:
+                    fd.write("%-28s %.4g\n" % (name, value))
+            for (name, value) in first.items():
+                if name.startswith('binary') or name.startswith('SIZE') or name == 'heap profiled':
+                    fd.write("%-28s %d\n" % (name, value))
+            for (r, u) in zip(sorted(parts), ranks):
+                fd.write("rank %d: rss %d kB, user %.3f s, sys %.3f s, vcsw %d, ivcsw %d, majflt %d%s\n" %
+                         (r, u.get('peak rss (kB)', 0), u.get('user cpu (s)', 0), u.get('sys cpu (s)', 0),
+                          u.get('voluntary ctx switches', 0), u.get('involuntary ctx switches', 0),
+                          u.get('major page faults', 0),
+                          ', cpu %d' % u['pinned cpu'] if 'pinned cpu' in u else ''))
+        for filename in parts.values():
+            os.remove(filename)
+
+
+###############################################################################
+def readMassif(massiffile, nsites=10):
+    """ Reads the peak snapshot of a valgrind massif output file
+
+    Arguments:
+        massiffile (string):  Path to the massif.out file
+        nsites (int):  Number of allocation sites to return
+
+    Returns:
+        dict with the heap, heap-extra and stack bytes of the peak snapshot
+        and 'sites', a list of (bytes, function) of the largest allocation
+        sites, i.e. the direct callers of the allocation functions
+    """
+    snapshots = []
+    current = None
+    with open(massiffile, 'r') as fd:
+        for line in fd:
+            line = line.rstrip('\n')
+            if line.startswith('snapshot='):
+                current = {'heap': 0, 'extra': 0, 'stacks': 0, 'tree': None, 'sites': []}
+                snapshots.append(current)
+            elif current is None:
+                continue
+            elif line.startswith('mem_heap_B='):
+                current['heap'] = int(line.split('=')[1])
+            elif line.startswith('mem_heap_extra_B='):
+                current['extra'] = int(line.split('=')[1])
+            elif line.startswith('mem_stacks_B='):
+                current['stacks'] = int(line.split('=')[1])
+            elif line.startswith('heap_tree='):
+                current['tree'] = line.split('=')[1]
+            elif line.startswith(' n') and not line.startswith('  '):
+                # First level of the tree: direct callers of malloc & co.
+                match = re.match(r'\s*n\d+:\s+(\d+)\s+(?:0x[0-9A-Fa-f]+:\s+)?(.*)$', line)
+                if match:
+                    current['sites'].append((int(match.group(1)), match.group(2).strip()))
+
+    if not snapshots:
+        return None
+    peaks = [snap for snap in snapshots if snap['tree'] == 'peak']
+    if not peaks:
+        peaks = [max([snap for snap in snapshots if snap['tree'] == 'detailed'] or snapshots,
+                     key=lambda snap: snap['heap'])]
+    peak = peaks[-1]
+    peak['sites'] = sorted(peak['sites'], reverse=True)[:nsites]
+    return peak
+
+
+def writeHeapSummary(filename, peak):
+    """ Writes the summary of a heap profile as 'name value' lines """
+    with open(filename, 'w') as fd:
+        fd.write("peak heap (B)        %d\n" % peak['heap'])
+        fd.write("peak heap extra (B)  %d\n" % peak['extra'])
+        fd.write("peak stacks (B)      %d\n" % peak['stacks'])
+        for (nbytes, site) in peak['sites']:
+            fd.write("site %12d %s\n" % (nbytes, site))
+
+
+def readHeapSummary(filename):
+    """ Reads a summary written by writeHeapSummary(); returns None if it is missing """
+    try:
+        with open(filename, 'r') as fd:
+            lines = fd.readlines()
+    except IOError:
+        return None
+    summary = {'sites': {}}
+    for line in lines:
+        if line.startswith('site '):
+            (nbytes, site) = line[5:].strip().split(' ', 1)
+            summary['sites'][site] = int(nbytes)
+        elif line.strip():
+            summary[line.rsplit(None, 1)[0].strip()] = int(line.split()[-1])
+    return summary
+
+
+def heapReport(logdir, store=None):
+    """ Summarizes the massif profiles in logdir and diffs them with the previous campaign
+
+    For every <session>.massif.<np> file, a summary <session>.heap.<np> with the
+    peak snapshot and the top allocation sites is written to logdir.  If store
+    is given, the summary is compared with the one in store/<logdir name>/, left
+    there by the previous campaign, and then replaces it.
+
+    Arguments:
+        logdir (string):  Directory with the massif files, e.g. ./mpiLog
+        store (string):  Directory that keeps the summaries between campaigns
+    """
+    profiles = sorted(glob.glob(os.path.join(logdir, '*.massif.*')))
+    if not profiles:
+        print("No heap profiles found in %s" % logdir)
+        return
+    if store:
+        store = os.path.join(store, os.path.basename(os.path.normpath(logdir)))
+        if not os.path.isdir(store):
+            os.makedirs(store)
+
+    for massiffile in profiles:
+        peak = readMassif(massiffile)
+        if peak is None:
+            print("[%s] ...no snapshots in massif file" % os.path.basename(massiffile))
+            continue
+        name = os.path.basename(massiffile).replace('.massif.', '.heap.')
+        summaryfile = os.path.join(logdir, name)
+        writeHeapSummary(summaryfile, peak)
+
+        print("[%s] peak heap %.1f MB (extra %.1f MB, stacks %.1f MB)" %
+              (name, peak['heap'] / 1048576.0, peak['extra'] / 1048576.0, peak['stacks'] / 1048576.0))
+        for (nbytes, site) in peak['sites']:
+            print("    %10.1f MB  %s" % (nbytes / 1048576.0, site))
+
+        if not store:
+            continue
+        previous = readHeapSummary(os.path.join(store, name))
+        if previous is None:
+            print("    no previous profile to compare with")
+        else:
+            current = readHeapSummary(summaryfile)
+            delta = current['peak heap (B)'] - previous['peak heap (B)']
+            print("    change of peak heap since previous campaign : %+.1f MB" % (delta / 1048576.0))
+            sites = set(current['sites']) | set(previous['sites'])
+            changes = sorted([(current['sites'].get(site, 0) - previous['sites'].get(site, 0), site)
+                              for site in sites], key=lambda c: -abs(c[0]))
+            for (change, site) in changes[:5]:
+                if change != 0:
+                    print("    %+10.1f MB  %s" % (change / 1048576.0, site))
+        shutil.copy(summaryfile, os.path.join(store, name))
+        print("")
+
+
+###############################################################################
+def readFlatProfile(gproffile):
+    """ Reads the flat profile of a gprof report
+
+    Returns:
+        dict of {function: self seconds}
+    """
+    profile = {}
+    inFlat = False
+    regex = re.compile(r'^\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+(?:\d+\s+[\d.]+\s+[\d.]+\s+)?(\S.*)$')
+    with open(gproffile, 'r') as fd:
+        for line in fd:
+            if line.startswith('Flat profile'):
+                inFlat = True
+            elif inFlat and (line.startswith('Call graph') or line.startswith('\f')):
+                break
+            elif inFlat:
+                match = regex.match(line)
+                if match:
+                    name = match.group(4).strip()
+                    profile[name] = profile.get(name, 0.0) + float(match.group(3))
+    return profile
+
+
+def gprofDiff(dirA, dirB, top=20):
+    """ Prints the subroutines whose self time changed most between two profiling campaigns
+
+    RunTests (with GPROF set) keeps the profiles as <GPROF_DIR>/<revision>/<logdir>/<session>.gprof.<np>.
+
+    Arguments:
+        dirA (string):  Profile directory of the old revision, e.g. profiles/1020/srlLog
+        dirB (string):  Profile directory of the new revision
+        top (int):  Number of subroutines to list per profile and overall
+    """
+    namesA = set([os.path.basename(f) for f in glob.glob(os.path.join(dirA, '*.gprof.*'))])
+    namesB = set([os.path.basename(f) for f in glob.glob(os.path.join(dirB, '*.gprof.*'))])
+    common = sorted(namesA & namesB)
+    for name in sorted(namesA ^ namesB):
+        print("[%s] ...only in %s" % (name, dirA if name in namesA else dirB))
+    if not common:
+        print("No common profiles in %s and %s" % (dirA, dirB))
+        return
+
+    overall = {}
+    for name in common:
+        profA = readFlatProfile(os.path.join(dirA, name))
+        profB = readFlatProfile(os.path.join(dirB, name))
+        totalA = sum(profA.values())
+        totalB = sum(profB.values())
+        changes = []
+        for func in set(profA) | set(profB):
+            delta = profB.get(func, 0.0) - profA.get(func, 0.0)
+            changes.append((delta, func))
+            overall[func] = overall.get(func, 0.0) + delta
+        changes.sort(key=lambda c: -abs(c[0]))
+
+        print("[%s] total self time %.2f s -> %.2f s" % (name, totalA, totalB))
+        print("    %-32s %10s %10s %10s" % ('subroutine', 'old (s)', 'new (s)', 'change'))
+        for (delta, func) in changes[:top]:
+            if delta == 0.0:
+                break
+            print("    %-32s %10.2f %10.2f %+10.2f" % (func, profA.get(func, 0.0), profB.get(func, 0.0), delta))
+        print("")
+
+    print("Largest changes over all profiles")
+    for (delta, func) in sorted([(d, f) for (f, d) in overall.items()], key=lambda c: -abs(c[0]))[:top]:
+        if delta == 0.0:
+            break
+        print("    %-32s %+10.2f s" % (func, delta))
+
+
+###############################################################################
+# Timing lines that nek prints.  'done :: <label> <time> sec' closes most setup
+# phases; setupds reports the gather-scatter setup; the runtime statistics at
+# the end have one '<name> time <count> <total> <fraction>' line per solver part.
+PHASE_DONE = re.compile(r'done ::\s+(.*?)[\s,:]+' + FLOAT + r'\s*sec')
+PHASE_SETUPDS = re.compile(r'setupds time\s*' + FLOAT)
+PHASE_RUNSTAT = re.compile(r'^\s*(\w+) time\s+(\d+)\s+' + FLOAT + r'(?:\s+' + FLOAT + r')?\s*$')
+PHASE_IO = re.compile(r'(?i)\b(io|i/o)[- ]time\s*[:=]?\s*' + FLOAT)
+PHASE_TOTALS = (('elapsed time', re.compile(r'total elapsed time\s*:?\s*' + FLOAT)),
+                ('time/timestep', re.compile(r'time/timestep\s*:?\s*' + FLOAT)))
+IO_WORDS = re.compile(r'(?i)read|write|load|dump|output|restart|checkpoint|\bfld\b|\.f\d')
+
+
+def toFloat(text):
+    """ Converts a Fortran-formatted number (1.0E-02, 1.0D-02) to a float """
+    return float(text.replace('D', 'E').replace('d', 'e'))
+
+
+def phaseTimes(logfile):
+    """ Extracts every phase timing from a logfile into one record
+
+    Returns:
+        OrderedDict of {metric: seconds}.  Setup phases are named 'setup: <label>',
+        I/O phases 'io: <label>' and parts of the runtime statistics 'solve: <name>'.
+        The totals are 'setup time', 'io time', 'solve time' (the 'total solver
+        time' of Analysis.py), 'elapsed time' and 'time/timestep'.
+        Returns None if the logfile is missing.
+    """
+    if not os.path.isfile(logfile):
+        return None
+    phases = collections.OrderedDict()
+
+    def add(metric, value):
+        phases[metric] = phases.get(metric, 0.0) + value
+
+    with open(logfile, 'r') as fd:
+        for line in fd:
+            match = PHASE_DONE.search(line)
+            if match:
+                label = re.sub(r'\s+', ' ', match.group(1)).strip()
+                kind = 'io' if IO_WORDS.search(label) else 'setup'
+                add('%s: %s' % (kind, label), toFloat(match.group(2)))
+                continue
+            match = PHASE_SETUPDS.search(line)
+            if match:
+                add('setup: gs_setup (setupds)', toFloat(match.group(1)))
+                continue
+            match = PHASE_RUNSTAT.match(line)
+            if match:
+                phases['solve: %s' % match.group(1)] = toFloat(match.group(3))
+                continue
+            match = PHASE_IO.search(line)
+            if match:
+                add('io: output', toFloat(match.group(2)))
+                continue
+            for (metric, regex) in PHASE_TOTALS:
+                match = regex.search(line)
+                if match:
+                    phases[metric] = toFloat(match.group(1))
+
+    phases['setup time'] = sum([v for (k, v) in phases.items() if k.startswith('setup: ')])
+    phases['io time'] = sum([v for (k, v) in phases.items() if k.startswith('io: ')])
+    solve = solverTime(logfile)
+    if solve is not None:
+        phases['solve time'] = solve
+    return phases
+
+
+LOG_DIRS = ('srlLog', 'srl2Log', 'mpiLog', 'mpi2Log')
+
+
+def campaignLogs(logdirs):
+    """ Returns [(logdir, run name, path)] for every regular logfile in logdirs
+
+    Logs of benchmark reruns (<rea>.log.<np>.<tag>) are left out.
+    """
+    logs = []
+    for logdir in logdirs:
+        for logfile in sorted(glob.glob(os.path.join(logdir, '*.log.*'))):
+            if re.search(r'\.log\.\d+$', logfile):
+                logs.append((logdir, os.path.basename(logfile), logfile))
+    return logs
+
+
+def phaseReport(logdirs, histfile=None, rel=0.25, floor=0.5, verbose=False, save=True,
+                setupFloor=0.02, spread=3.0):
+    """ Prints the setup/solve/IO breakdown of every run and checks it against the history
+
+    Every phase and the setup, solve and I/O totals are stored in the history
+    of the campaign's compiler.  A value fails its check if it exceeds the
+    median of the last campaigns by more than rel and by more than a floor in
+    seconds.  Setup phases (gs_setup, ...) take tenths of a second, so theirs
+    is setupFloor, or spread times the median absolute deviation of their
+    history if that is larger, instead of floor.
+
+    Arguments:
+        logdirs (list of string):  Log directories of the campaign
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative tolerance of the history checks
+        floor (float):  Smallest change in seconds that can fail a check
+        verbose (bool):  Print every phase, not only the totals
+        setupFloor (float):  Smallest change in seconds that can fail a setup phase
+        spread (float):  Deviations of the history by which a setup phase may vary
+        save (bool):  Add the campaign to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    trusted = timingTrusted(info)
+    num_test = 0
+    num_success = 0
+
+    for (logdir, run, logfile) in campaignLogs(logdirs):
+        phases = phaseTimes(logfile)
+        if not phases:
+            continue
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        print("[%s] setup %.3f s, solve %s s, io %.3f s" %
+              (name, phases['setup time'],
+               '%.3f' % phases['solve time'] if 'solve time' in phases else '-', phases['io time']))
+        if not trusted or profiled(info, run):
+            continue
+        failed = []
+        for (metric, value) in phases.items():
+            baseline = history.baseline(logdir, run, metric, exclude=info['campaign'],
+                                        speed=info.get('speed'))
+            limit = floor
+            if metric.startswith('setup: '):
+                limit = max(setupFloor, spread * history.spread(logdir, run, metric, exclude=info['campaign'],
+                                                                speed=info.get('speed')))
+            history.add(info, logdir, run, metric, value)
+            # Single phases are only reported if they regressed, unless verbose
+            if ':' in metric and not verbose and not exceeds(value, baseline, rel, limit):
+                continue
+            num_test += 1
+            if historyCheck(name, metric, value, baseline, rel, limit):
+                num_success += 1
+            else:
+                failed.append(metric)
+        if failed:
+            print("[%s]...slower than history : %s" % (name, ", ".join(failed)))
+            print("%s : F " % name)
+        else:
+            print("%s : ." % name)
+        print("")
+
+    if save:
+        history.save()
+    print("\n\nPhase Summary :     %i/%i checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+# Parts of nek's runtime statistics that are communication
+COMM_PARTS = ('gop', 'dsum', 'vdss', 'dsnd', 'gs', 'sync', 'comm')
+GS_METHODS = (('pairwise', re.compile(r'pairwise times \(avg, min, max\):\s*' + FLOAT)),
+              ('crystal router', re.compile(r'crystal router\s*:\s*' + FLOAT)),
+              ('all reduce', re.compile(r'all reduce\s*:\s*' + FLOAT)))
+GS_USED = re.compile(r'used all_to_all method:\s*(.*?)\s*$')
+
+
+def gsStats(logfile):
+    """ Extracts the gather-scatter method selection from a logfile
+
+    gs_setup times the pairwise, crystal router and all-reduce exchanges of
+    every handle and picks the fastest one.
+
+    Returns:
+        dict with the number of handles ('handles'), the number of times each
+        method was picked ('used') and the sum of the average timings of each
+        method over all handles ('times')
+    """
+    stats = {'handles': 0, 'used': collections.OrderedDict(), 'times': collections.OrderedDict()}
+    try:
+        with open(logfile, 'r') as fd:
+            for line in fd:
+                if 'gs_setup:' in line:
+                    stats['handles'] += 1
+                    continue
+                for (method, regex) in GS_METHODS:
+                    match = regex.search(line)
+                    if match:
+                        stats['times'][method] = stats['times'].get(method, 0.0) + toFloat(match.group(1))
+                match = GS_USED.search(line)
+                if match:
+                    method = match.group(1)
+                    stats['used'][method] = stats['used'].get(method, 0) + 1
+    except IOError:
+        pass
+    return stats
+
+
+def commStats(logfile):
+    """ Returns the communication part of the solver time of a run
+
+    Returns:
+        dict with 'comm' (sum of the communication parts of the runtime
+        statistics, None if nek didn't print them), 'solve' (total solver time)
+        and 'fraction' (comm / solve, or None)
+    """
+    phases = phaseTimes(logfile) or {}
+    parts = [phases['solve: %s' % name] for name in COMM_PARTS if 'solve: %s' % name in phases]
+    comm = sum(parts) if parts else None
+    solve = phases.get('solve time')
+    fraction = None
+    if comm is not None and solve:
+        fraction = comm / solve
+    return {'comm': comm, 'solve': solve, 'fraction': fraction}
+
+
+def commReport(logdirs, nranks=4, histfile=None, save=True):
+    """ Prints the communication vs. computation split of the parallel runs
+
+    Arguments:
+        logdirs (list of string):  Log directories, e.g. ['mpiLog', 'mpi2Log']
+        nranks (int):  Rank count of the logs to analyze
+        histfile (string):  History file; by default the one of the campaign's compiler
+        save (bool):  Add the communication times to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    totalComm = 0.0
+    totalSolve = 0.0
+    usedTotal = collections.OrderedDict()
+
+    print("%-28s %7s %-32s %10s %10s %7s" % ('run', 'handles', 'methods used', 'comm (s)', 'solve (s)', 'comm %'))
+    for logdir in logdirs:
+        for logfile in sorted(glob.glob(os.path.join(logdir, '*.log.%d' % nranks))):
+            run = os.path.basename(logfile)
+            gs = gsStats(logfile)
+            comm = commStats(logfile)
+            for (method, count) in gs['used'].items():
+                usedTotal[method] = usedTotal.get(method, 0) + count
+            used = ', '.join(['%s %d' % (m, c) for (m, c) in gs['used'].items()]) or '-'
+            print("%-28s %7d %-32s %10s %10s %7s" %
+                  ('%s/%s' % (os.path.basename(os.path.normpath(logdir)), run), gs['handles'], used,
+                   '-' if comm['comm'] is None else '%.3f' % comm['comm'],
+                   '-' if comm['solve'] is None else '%.3f' % comm['solve'],
+                   '-' if comm['fraction'] is None else '%.1f' % (100.0 * comm['fraction'])))
+            for (method, t) in gs['times'].items():
+                history.add(info, logdir, run, 'gs %s time' % method, t)
+            if comm['fraction'] is not None:
+                totalComm += comm['comm']
+                totalSolve += comm['solve']
+                history.add(info, logdir, run, 'comm time', comm['comm'])
+                history.add(info, logdir, run, 'comm fraction', comm['fraction'])
+
+    print("")
+    print("gather-scatter methods used : %s" %
+          (', '.join(['%s %d' % (m, c) for (m, c) in usedTotal.items()]) or '-'))
+    if totalSolve > 0:
+        print("Campaign communication fraction : %.1f%% (%.3f s of %.3f s)" %
+              (100.0 * totalComm / totalSolve, totalComm, totalSolve))
+    else:
+        print("Campaign communication fraction : - (no runtime statistics in the logs)")
+    if save:
+        history.save()
+
+
+###############################################################################
+# Values of the <case>.build files written by build_nek in RunTests
+BUILD_TIMES = ('build time (s)', 'compile time (s)')
+BUILD_SIZES = ('binary text (kB)', 'binary data (kB)', 'binary bss (kB)')
+
+
+def buildReport(logdirs, histfile=None, rel=0.25, floor=2.0, sizeRel=0.02, fileFloor=0.5, save=True):
+    """ Prints the build time and binary size of every example build and checks them against the history
+
+    The wall time of the build, the summed compile time of its source files
+    and the text/data/bss sizes of the binary go to the history of the
+    campaign's compiler.  The compile time of every source file, as the median
+    over the builds of a log directory, is stored under run 'sources' and
+    only reported if it regressed.
+
+    Arguments:
+        logdirs (list of string):  Log directories of the campaign
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative tolerance of the time checks
+        floor (float):  Smallest change in seconds that can fail a build time check
+        sizeRel (float):  Relative tolerance of the binary size checks
+        fileFloor (float):  Smallest change in seconds that can fail a source file check
+        save (bool):  Add the campaign to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    trusted = timingTrusted(info)
+    num_test = 0
+    num_success = 0
+
+    for logdir in logdirs:
+        shortdir = os.path.basename(os.path.normpath(logdir))
+        sources = collections.OrderedDict()
+        for buildfile in sorted(glob.glob(os.path.join(logdir, '*.build'))):
+            run = os.path.basename(buildfile)
+            name = '%s/%s' % (shortdir, run)
+            build = readUsage(buildfile)
+            print("[%s] build %.1f s, compile %s s, text %s kB, data+bss %s kB" %
+                  (name, build.get('build time (s)', 0.0),
+                   '%.1f' % build['compile time (s)'] if 'compile time (s)' in build else '-',
+                   '%d' % build['binary text (kB)'] if 'binary text (kB)' in build else '-',
+                   '%d' % (build['binary data (kB)'] + build['binary bss (kB)'])
+                   if 'binary bss (kB)' in build else '-'))
+            failed = []
+            for metric in BUILD_TIMES + BUILD_SIZES:
+                if metric not in build or (metric in BUILD_TIMES and not trusted):
+                    continue
+                value = build[metric]
+                speed = info.get('speed') if metric in BUILD_TIMES else None
+                baseline = history.baseline(logdir, run, metric, exclude=info['campaign'], speed=speed)
+                history.add(info, logdir, run, metric, value)
+                num_test += 1
+                if metric in BUILD_TIMES:
+                    passed = historyCheck(name, metric, value, baseline, rel, floor)
+                else:
+                    passed = historyCheck(name, metric, value, baseline, sizeRel)
+                if passed:
+                    num_success += 1
+                else:
+                    failed.append(metric)
+            for (key, value) in build.items():
+                if key.startswith('file '):
+                    sources.setdefault(key[5:], []).append(value)
+            if failed:
+                print("[%s]...worse than history : %s" % (name, ", ".join(failed)))
+                print("%s : F " % name)
+            else:
+                print("%s : ." % name)
+            print("")
+
+        if not sources or not trusted:
+            continue
+        name = '%s/sources' % shortdir
+        times = [(median(t), src) for (src, t) in sources.items()]
+        print("[%s] slowest : %s" %
+              (name, ", ".join(['%s %.2f s' % (src, t) for (t, src) in sorted(times, reverse=True)[:5]])))
+        failed = []
+        for (value, src) in sorted(times, reverse=True):
+            metric = 'compile: %s' % src
+            baseline = history.baseline(logdir, 'sources', metric, exclude=info['campaign'],
+                                        speed=info.get('speed'))
+            history.add(info, logdir, 'sources', metric, value)
+            if exceeds(value, baseline, rel, fileFloor):
+                num_test += 1
+                historyCheck(name, metric, value, baseline, rel, fileFloor)
+                failed.append(src)
+        if failed:
+            print("[%s]...slower to compile than history : %s" % (name, ", ".join(failed)))
+            print("%s : F " % name)
+        else:
+            print("%s : ." % name)
+        print("")
+
+    if save:
+        history.save()
+    print("\n\nBuild Summary :     %i/%i checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+def errorValues(errfile):
+    """ Returns every number on the error lines that tester() greps into <rea>.err.<np>
+
+    The compiler message that tester() appends to the file is skipped.
+    """
+    values = []
+    try:
+        with open(errfile, 'r') as fd:
+            for line in fd:
+                if 'nek5000' in line:
+                    continue
+                values.extend([toFloat(v) for v in re.findall(FLOAT, line)])
+    except (IOError, ValueError):
+        pass
+    return values
+
+
+def errorDeviation(values, reference):
+    """ Returns the largest relative difference between two lists of error values, or None """
+    if not values or len(values) != len(reference):
+        return None
+    return max([abs(v - r) / max(abs(r), 1e-30) for (v, r) in zip(values, reference)])
+
+
+def flagReport(logdirs, tol=1e-6):
+    """ Prints the flag matrix benchmark: solver time and accuracy of every flag set
+
+    For every <rea>.flagset that flag_bench in ExTest leaves in a log directory,
+    the runs of the flag sets (<rea>.log.1.<tag>) are compared with the run of
+    the default build.  The accuracy deviation is the largest relative change
+    of the error values that the error-norm checks of Analysis.py read from
+    <rea>.err.1.
+
+    Arguments:
+        logdirs (list of string):  Log directories, e.g. ['srlLog', 'srl2Log']
+        tol (float):  Largest accepted accuracy deviation
+    """
+    for logdir in logdirs:
+        for flagfile in sorted(glob.glob(os.path.join(logdir, '*.flagset'))):
+            rea = os.path.basename(flagfile)[:-len('.flagset')]
+            base = os.path.join(logdir, rea)
+            sets = [('', 'default')]
+            with open(flagfile, 'r') as fd:
+                for line in fd:
+                    cols = line.split(None, 1)
+                    if len(cols) == 2:
+                        sets.append(('.' + cols[0], cols[1].strip()))
+
+            reference = errorValues(base + '.err.1')
+            baseTime = solverTime(base + '.log.1')
+            print("%s/%s" % (os.path.basename(os.path.normpath(logdir)), rea))
+            print("  %-32s %10s %8s %12s %10s %10s" %
+                  ('flags', 'solve (s)', 'speedup', 'err dev', 'build (s)', 'text (kB)'))
+            best = None
+            for (tag, flags) in sets:
+                t = solverTime(base + '.log.1' + tag)
+                dev = errorDeviation(errorValues(base + '.err.1' + tag), reference)
+                build = {}
+                if os.path.exists(base + '.build' + tag):
+                    build = readUsage(base + '.build' + tag)
+                accurate = tag == '' or (dev is not None and dev <= tol)
+                print("  %-32s %10s %8s %12s %10s %10s %s" %
+                      (flags, '-' if t is None else '%.3f' % t,
+                       '%.2f' % (baseTime / t) if t and baseTime else '-',
+                       '-' if tag == '' else ('?' if dev is None else '%.2e' % dev),
+                       '%.1f' % build['build time (s)'] if 'build time (s)' in build else '-',
+                       '%d' % build['binary text (kB)'] if 'binary text (kB)' in build else '-',
+                       '' if accurate else '(accuracy off)'))
+                if t is not None and accurate and (best is None or t < best[0]):
+                    best = (t, flags)
+            if best:
+                print("  fastest accurate flags : %s (%.3f s)" % (best[1], best[0]))
+            print("")
+
+
+###############################################################################
+ANALYSIS_RESULT = re.compile(r'^(.*\S)\s+:\s+(\.|F)\s*$')
+ANALYSIS_SUMMARY = re.compile(r'Test Summary :\s+(\d+)/(\d+)')
+
+
+def analysisResults(analysisfile):
+    """ Reads the test results from the output of Analysis.py
+
+    Returns:
+        (list of (test name, passed), (successful checks, checks) or None)
+    """
+    results = []
+    summary = None
+    try:
+        with open(analysisfile, 'r') as fd:
+            for line in fd:
+                match = ANALYSIS_RESULT.match(line)
+                if match:
+                    results.append((match.group(1), match.group(2) == '.'))
+                match = ANALYSIS_SUMMARY.search(line)
+                if match:
+                    summary = (int(match.group(1)), int(match.group(2)))
+    except IOError:
+        pass
+    return (results, summary)
+
+
+def campaignsReport(dirs):
+    """ Prints one report for the campaigns of several compilers
+
+    Every directory is the result directory of one compiler, with the
+    campaign.info of RunTests and the Analysis.log of Analysis.py, as
+    Multi_RunTest leaves them.
+
+    Arguments:
+        dirs (list of string):  Result directories, e.g. ['PGI', 'GNU', 'INTEL']
+    """
+    print("%-10s %-24s %-12s %9s %13s %13s" %
+          ('compiler', 'campaign', 'revision', 'time (s)', 'tests passed', 'checks passed'))
+    failures = collections.OrderedDict()
+    for d in dirs:
+        info = campaignInfo(os.path.join(d, 'campaign.info'))
+        (results, summary) = analysisResults(os.path.join(d, 'Analysis.log'))
+        passed = len([r for r in results if r[1]])
+        failures[d] = [name for (name, ok) in results if not ok]
+        print("%-10s %-24s %-12s %9s %13s %13s" %
+              (os.path.basename(os.path.normpath(d)), info['campaign'], info['revision'],
+               info.get('elapsed', '-'),
+               '%d/%d' % (passed, len(results)) if results else '-',
+               '%d/%d' % summary if summary else '-'))
+
+    for (d, failed) in failures.items():
+        if failed:
+            print("\n%s failed:" % os.path.basename(os.path.normpath(d)))
+            for name in failed:
+                print("    %s" % name)
+
+
+###############################################################################
+# Pressure iteration checks of Analysis.py
+ITER_KEYS = ('gmres: ', 'U-Press ', 'U-PRES ', 'PRES: ')
+LOG_LABELS = collections.OrderedDict((('srlLog', 'SRL'), ('srl2Log', 'SRL2'),
+                                      ('mpiLog', 'MPI'), ('mpi2Log', 'MPI2')))
+
+
+def analysisSpec(analysisfile=None):
+    """ Reads the checks that Analysis.py runs from its source
+
+    Returns:
+        list of (test name, logfile, list of ['keyword', target, tolerance, col])
+        in the order of Analysis.py
+    """
+    if analysisfile is None:
+        analysisfile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Analysis.py')
+    spec = []
+    logfile = None
+    value = []
+    pending = None
+    with open(analysisfile, 'r') as fd:
+        for line in fd:
+            text = line.strip()
+            if pending is not None:
+                pending += text
+            elif re.match(r'^log\s*=\s*"', text):
+                logfile = text.split('"')[1]
+            elif re.match(r'^value\s*=\s*\[', text):
+                pending = text.split('=', 1)[1]
+            else:
+                match = re.match(r'^Run\("([^"]*)"', text)
+                if match:
+                    spec.append((match.group(1), logfile, value))
+            if pending is not None and pending.count('[') == pending.count(']'):
+                try:
+                    value = ast.literal_eval(pending)
+                except (SyntaxError, ValueError):
+                    value = []
+                pending = None
+    return spec
+
+
+def iterationKeys(spec=None):
+    """ Returns {logfile: [keyword, col]} of the pressure iteration checks in Analysis.py
+
+    Logfiles are named as in Analysis.py, e.g. ./srlLog/axi.log.1
+    """
+    keys = {}
+    for (name, logfile, checks) in spec if spec is not None else analysisSpec():
+        for check in checks:
+            if check[0] in ITER_KEYS and logfile not in keys:
+                keys[logfile] = [check[0], check[3]]
+    return keys
+
+
+def analyzeCompiler(args):
+    """ Collects the cells of the cross-compiler matrix for one result directory
+
+    Runs Analysis.py in the directory first if it has no Analysis.log, or if rerun.
+
+    Arguments:
+        args (tuple):  (result directory, rerun); one tuple so that it can be
+                       mapped over a multiprocessing pool
+
+    Returns:
+        OrderedDict of {(run, log label): {'time', 'iters', 'passed', 'example'}}, where
+        passed is None if a test of the cell is missing from Analysis.log
+    """
+    (resultdir, rerun) = args
+    analysislog = os.path.join(resultdir, 'Analysis.log')
+    if rerun or not os.path.exists(analysislog):
+        mode = 'mpi' if os.path.isdir(os.path.join(resultdir, 'mpiLog')) else 'serial'
+        with open(analysislog, 'w') as fd:
+            subprocess.call([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                          'Analysis.py'), mode],
+                            cwd=resultdir, stdout=fd, stderr=subprocess.STDOUT)
+
+    outcomes = {}
+    for (name, passed) in analysisResults(analysislog)[0]:
+        outcomes.setdefault(name, []).append(passed)
+
+    spec = analysisSpec()
+    iterKeys = iterationKeys(spec)
+    cells = collections.OrderedDict()
+    for (name, logfile, checks) in spec:
+        match = re.match(r'\./(\w+)/(.*)\.(log|err)\.(\d+)$', logfile or '')
+        if not match or match.group(1) not in LOG_LABELS:
+            continue
+        key = ('%s.log.%s' % (match.group(2), match.group(4)), LOG_LABELS[match.group(1)])
+        cell = cells.get(key)
+        if cell is None:
+            log = os.path.join(resultdir, match.group(1), key[0])
+            if not os.path.exists(log):
+                continue
+            cell = {'example': name.split('/')[0].replace('Example ', ''), 'time': solverTime(log),
+                    'iters': None, 'outcomes': []}
+            cells[key] = cell
+        cell['outcomes'].extend(outcomes.get(name, [None]))
+        if cell['iters'] is None and logfile in iterKeys:
+            iters = findValues(os.path.join(resultdir, match.group(1), key[0]), *iterKeys[logfile])
+            if iters:
+                cell['iters'] = mean(iters)
+
+    # A cell fails if one of its tests failed; it is unknown if one is missing from Analysis.log
+    for cell in cells.values():
+        if False in cell['outcomes']:
+            cell['passed'] = False
+        elif None in cell['outcomes']:
+            cell['passed'] = None
+        else:
+            cell['passed'] = True
+        del cell['outcomes']
+    return cells
+
+
+def crossReport(dirs, slow=0.2, rerun=False):
+    """ Prints the example x discretization x compiler matrix of a campaign
+
+    The result directories are analyzed in parallel.  Every cell has the
+    solver time, the average pressure iterations and whether the checks of
+    Analysis.py passed ('.') or failed ('F').  The fastest compiler of a row
+    is marked with '*', and cells more than slow slower than the median of
+    the row with '!'.
+
+    Arguments:
+        dirs (list of string):  Result directories, e.g. ['PGI', 'GNU', 'INTEL']
+        slow (float):  Relative slowdown vs. the row median that is highlighted
+        rerun (bool):  Rerun Analysis.py even if a directory has an Analysis.log
+    """
+    pool = multiprocessing.Pool(len(dirs))
+    try:
+        results = pool.map(analyzeCompiler, [(d, rerun) for d in dirs])
+    finally:
+        pool.close()
+    names = [os.path.basename(os.path.normpath(d)) for d in dirs]
+
+    rows = []
+    for cells in results:
+        for key in cells:
+            if key not in rows:
+                rows.append(key)
+
+    fastest = dict([(n, 0) for n in names])
+    slower = dict([(n, 0) for n in names])
+    failed = dict([(n, 0) for n in names])
+    print("%-12s %-24s %-5s" % ('example', 'run', 'disc') +
+          ''.join([" %-22s" % n for n in names]))
+    print("%-12s %-24s %-5s" % ('', '', '') + ''.join([" %-22s" % 'time (s) iters ok' for n in names]))
+    for key in rows:
+        row = [cells.get(key) for cells in results]
+        times = [c['time'] for c in row if c and c['time'] is not None]
+        best = min(times) if times else None
+        ref = median(times) if times else None
+        line = "%-12s %-24s %-5s" % ([c for c in row if c][0]['example'][:12], key[0], key[1])
+        for (n, c) in zip(names, row):
+            if c is None:
+                line += " %-22s" % '-'
+                continue
+            mark = ''
+            if c['time'] is not None and len(times) > 1:
+                if c['time'] == best:
+                    mark = '*'
+                    fastest[n] += 1
+                elif c['time'] > (1.0 + slow) * ref:
+                    mark = '!'
+                    slower[n] += 1
+            if c['passed'] is False:
+                failed[n] += 1
+            line += " %-22s" % ("%8s %6s %s%s" %
+                                ('-' if c['time'] is None else '%.2f' % c['time'],
+                                 '-' if c['iters'] is None else '%.1f' % c['iters'],
+                                 {True: '.', False: 'F', None: '?'}[c['passed']], mark))
+        print(line)
+
+    print("")
+    print("* fastest compiler of the row, ! more than %d%% slower than the row median" % (100 * slow))
+    for n in names:
+        print("%-8s fastest in %d rows, slow in %d, failed in %d" % (n, fastest[n], slower[n], failed[n]))
+
+
+###############################################################################
+# Log directories of the Pn-Pn and the Pn-Pn-2 runs of the same tests
+FORMULATION_PAIRS = (('srlLog', 'srl2Log'), ('mpiLog', 'mpi2Log'))
+
+
+def formulationReport(histfile=None, rel=0.15, save=True):
+    """ Compares the Pn-Pn and the Pn-Pn-2 runs of every example
+
+    For every run that exists in both log directories of a pair, prints the
+    solver times, the average pressure iterations (the iteration checks of
+    Analysis.py, e.g. 'PRES: ' vs. 'U-Press ') and the largest relative
+    difference of the error values, with the Pn-Pn-2/Pn-Pn ratios.  The ratios
+    are added to the history, under the Pn-Pn-2 log directory, and a ratio
+    that moved by more than rel from the median of the last campaigns, in
+    either direction, fails.
+
+    Arguments:
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative change of a ratio that fails its check
+        save (bool):  Add the ratios to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    iterKeys = iterationKeys()
+    num_test = 0
+    num_success = 0
+
+    print("%-28s %10s %10s %7s %8s %8s %7s %9s" %
+          ('run', 'Pn-Pn (s)', 'Pn-Pn-2', 'ratio', 'iters', 'iters-2', 'ratio', 'err dev'))
+    for (logdir, logdir2) in FORMULATION_PAIRS:
+        for (_, run, logfile) in campaignLogs([logdir]):
+            logfile2 = os.path.join(logdir2, run)
+            if not os.path.exists(logfile2):
+                continue
+            name = '%s/%s' % (logdir2, run)
+            (t, t2) = (solverTime(logfile), solverTime(logfile2))
+            iters = [None, None]
+            for (i, (d, f)) in enumerate(((logdir, logfile), (logdir2, logfile2))):
+                key = iterKeys.get('./%s/%s' % (d, run))
+                values = findValues(f, *key) if key else []
+                if values:
+                    iters[i] = mean(values)
+            errfile = re.sub(r'\.log\.', '.err.', run)
+            dev = errorDeviation(errorValues(os.path.join(logdir2, errfile)),
+                                 errorValues(os.path.join(logdir, errfile)))
+
+            ratios = collections.OrderedDict()
+            if t and t2 is not None and not profiled(info, run):
+                ratios['time ratio'] = t2 / t
+            if iters[0] and iters[1] is not None:
+                ratios['iteration ratio'] = iters[1] / iters[0]
+            print("%-28s %10s %10s %7s %8s %8s %7s %9s" %
+                  (name, '-' if t is None else '%.3f' % t, '-' if t2 is None else '%.3f' % t2,
+                   '%.3f' % ratios['time ratio'] if 'time ratio' in ratios else '-',
+                   '-' if iters[0] is None else '%.1f' % iters[0],
+                   '-' if iters[1] is None else '%.1f' % iters[1],
+                   '%.3f' % ratios['iteration ratio'] if 'iteration ratio' in ratios else '-',
+                   '-' if dev is None else '%.1e' % dev))
+
+            for (metric, value) in ratios.items():
+                baseline = history.baseline(logdir2, run, metric, exclude=info['campaign'])
+                history.add(info, logdir2, run, metric, value)
+                if baseline is None:
+                    continue
+                num_test += 1
+                if abs(value - baseline) > rel * baseline:
+                    print("[%s] %s moved : %.3f (baseline %.3f, %+.1f%%)" %
+                          (name, metric, value, baseline, 100.0 * (value - baseline) / baseline))
+                    print("%s : F " % name)
+                else:
+                    num_success += 1
+
+    if save:
+        history.save()
+    print("\n\nFormulation Summary :     %i/%i ratios within %d%% of their history" %
+          (num_success, num_test, 100 * rel))
+
+
+###############################################################################
+def timingStats(times):
+    """ Returns the statistics of repeated timings
+
+    Returns:
+        dict with 'n', 'min', 'median', 'mean' and 'cv' (standard deviation
+        over mean; 0 for a single timing)
+    """
+    avg = mean(times)
+    cv = 0.0
+    if len(times) > 1 and avg > 0:
+        cv = math.sqrt(sum([(t - avg) ** 2 for t in times]) / (len(times) - 1)) / avg
+    return {'n': len(times), 'min': min(times), 'median': median(times), 'mean': avg, 'cv': cv}
+
+
+def repeatReport(logdirs, histfile=None, rel=0.1, cvmax=0.05, save=True):
+    """ Prints the statistics of the repeated timing runs and checks them against the history
+
+    Every <rea>.log.1 with repetitions <rea>.log.1.r<i> (REPEAT in RunTests)
+    gets the min, median and coefficient of variation of its total solver
+    time.  The min and median go to the history, and the median is checked
+    against the median of the last campaigns.  A run whose CV is above
+    cvmax is too noisy for its timing check to be trusted; it is reported,
+    and a regression of it is not counted as a failure.
+
+    Arguments:
+        logdirs (list of string):  Log directories, e.g. ['srlLog', 'srl2Log']
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative tolerance of the median check
+        cvmax (float):  Largest CV for which the timing check is trusted
+        save (bool):  Add the statistics to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    trusted = timingTrusted(info)
+    num_test = 0
+    num_success = 0
+    noisy = []
+
+    print("%-28s %3s %10s %10s %7s" % ('run', 'n', 'min (s)', 'median (s)', 'cv %'))
+    for (logdir, run, logfile) in campaignLogs(logdirs):
+        repeats = glob.glob(logfile + '.r*')
+        if not repeats:
+            continue
+        times = [t for t in [solverTime(f) for f in [logfile] + sorted(repeats)] if t is not None]
+        if not times:
+            continue
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        stats = timingStats(times)
+        print("%-28s %3d %10.3f %10.3f %7.1f%s" %
+              (name, stats['n'], stats['min'], stats['median'], 100.0 * stats['cv'],
+               '  too noisy' if stats['cv'] > cvmax else ''))
+        if stats['cv'] > cvmax:
+            noisy.append(name)
+        if not trusted or profiled(info, run):
+            continue
+
+        baseline = history.baseline(logdir, run, 'solve time median', exclude=info['campaign'],
+                                    speed=info.get('speed'))
+        for metric in ('min', 'median', 'cv'):
+            history.add(info, logdir, run, 'solve time %s' % metric, stats[metric])
+        if exceeds(stats['median'], baseline, rel):
+            historyCheck(name, 'solve time median', stats['median'], baseline, rel)
+            if stats['cv'] > cvmax:
+                print("[%s]...slower, but the CV of %.1f%% is too high to trust it" % (name, 100.0 * stats['cv']))
+                continue
+            num_test += 1
+            print("%s : F " % name)
+        elif baseline is not None:
+            num_test += 1
+            num_success += 1
+
+    if noisy:
+        print("\nWARNING: the timings of %d runs vary by more than %.1f%%; their timing checks can't be trusted:" %
+              (len(noisy), 100.0 * cvmax))
+        for name in noisy:
+            print("    %s" % name)
+    if save:
+        history.save()
+    print("\n\nRepeat Summary :     %i/%i timing checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+# Two-sided 95% quantiles of Student's t distribution, by degrees of freedom
+T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+       2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+       2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def pairedSpeedup(timesA, timesB):
+    """ Returns the speedup of B over A with its 95% confidence interval from paired timings
+
+    The interval is the t interval of the mean log ratio log(A_i/B_i) of the
+    pairs, so drifts of the machine that hit both runs of a pair cancel.
+
+    Returns:
+        (speedup, low, high), or None for fewer than 2 pairs
+    """
+    logs = [math.log(a / b) for (a, b) in zip(timesA, timesB) if a > 0 and b > 0]
+    n = len(logs)
+    if n < 2:
+        return None
+    avg = mean(logs)
+    sd = math.sqrt(sum([(d - avg) ** 2 for d in logs]) / (n - 1))
+    t = T95[n - 2] if n - 2 < len(T95) else 1.960
+    half = t * sd / math.sqrt(n)
+    return (math.exp(avg), math.exp(avg - half), math.exp(avg + half))
+
+
+def abReport(logdir='abLog'):
+    """ Prints the per-example speedups of an interleaved A/B benchmark
+
+    AB_RunTest leaves the logs of the pairs as <rea>.log.1.a<i> and
+    <rea>.log.1.b<i>; pair i is run a, then b.  A speedup above 1 means the
+    candidate (B) is faster.  It is significant if its interval excludes 1.
+
+    Arguments:
+        logdir (string):  Directory with the logs of AB_RunTest
+    """
+    infofile = os.path.join(logdir, 'ab.info')
+    if os.path.exists(infofile):
+        with open(infofile, 'r') as fd:
+            sys.stdout.write(fd.read())
+        print("")
+
+    sessions = sorted(set([re.sub(r'\.log\.1\.a\d+$', '', os.path.basename(f))
+                           for f in glob.glob(os.path.join(logdir, '*.log.1.a*'))]))
+    print("%-16s %5s %10s %10s %8s %19s" % ('example', 'pairs', 'A (s)', 'B (s)', 'speedup', '95% interval'))
+    for rea in sessions:
+        timesA = []
+        timesB = []
+        for fileA in glob.glob(os.path.join(logdir, '%s.log.1.a*' % rea)):
+            fileB = re.sub(r'\.a(\d+)$', r'.b\1', fileA)
+            (a, b) = (solverTime(fileA), solverTime(fileB))
+            if a is not None and b is not None:
+                timesA.append(a)
+                timesB.append(b)
+        result = pairedSpeedup(timesA, timesB)
+        if result is None:
+            print("%-16s %5d %10s %10s %8s %19s" % (rea, len(timesA), '-', '-', '-', 'too few pairs'))
+            continue
+        (speedup, low, high) = result
+        verdict = ''
+        if low > 1.0:
+            verdict = 'B faster'
+        elif high < 1.0:
+            verdict = 'B slower'
+        print("%-16s %5d %10.3f %10.3f %8.3f     [%6.3f, %6.3f] %s" %
+              (rea, len(timesA), median(timesA), median(timesB), speedup, low, high, verdict))
+
+
+###############################################################################
+def metricValues(logdir, metric='solve time'):
+    """ Returns the values of a phase metric (see phaseTimes) in every log of a directory """
+    values = []
+    for logfile in sorted(glob.glob(os.path.join(logdir, '*.log.*'))):
+        value = (phaseTimes(logfile) or {}).get(metric)
+        if value is not None:
+            values.append(value)
+    return values
+
+
+def separated(statsA, statsB):
+    """ Returns True if the means of two sets of timings differ by more than their 95% Welch t interval """
+    n = min(statsA['n'], statsB['n'])
+    if n < 2:
+        return statsA['median'] != statsB['median']
+    spread = math.sqrt((statsA['cv'] * statsA['mean']) ** 2 / statsA['n'] +
+                       (statsB['cv'] * statsB['mean']) ** 2 / statsB['n'])
+    t = T95[n - 2] if n - 2 < len(T95) else 1.960
+    return abs(statsB['mean'] - statsA['mean']) > t * spread
+
+
+def bisectStep(logroot, rev, metric='solve time', check=False):
+    """ Classifies a revision of a bisection against the good and the bad one
+
+    Bisect_RunTest keeps the logs of every measured revision in
+    <logroot>/<rev>, and those of the two ends in <logroot>/good and
+    <logroot>/bad.  A revision is bad if the median of its metric is on the
+    bad side of the midpoint of the good and the bad median.
+
+    Arguments:
+        logroot (string):  Directory with one log directory per revision
+        rev (string):  Revision to classify
+        metric (string):  Phase metric, e.g. 'solve time'
+        check (bool):  Only check that good and bad can be told apart
+
+    Returns:
+        Exit status for git bisect run: 0 good, 1 bad (with check, 1 if good
+        and bad can't be told apart)
+    """
+    good = metricValues(os.path.join(logroot, 'good'), metric)
+    bad = metricValues(os.path.join(logroot, 'bad'), metric)
+    if not good or not bad:
+        print("No '%s' in the logs of the good or the bad revision" % metric)
+        return 1
+    (good, bad) = (timingStats(good), timingStats(bad))
+    if check:
+        print("good: median %.4g (cv %.1f%%), bad: median %.4g (cv %.1f%%)" %
+              (good['median'], 100.0 * good['cv'], bad['median'], 100.0 * bad['cv']))
+        if not separated(good, bad):
+            print("The good and the bad revision can't be told apart; use more repeats")
+            return 1
+        return 0
+
+    values = metricValues(os.path.join(logroot, rev), metric)
+    if not values:
+        print("%s : no '%s' in the logs" % (rev, metric))
+        return 125
+    stats = timingStats(values)
+    threshold = 0.5 * (good['median'] + bad['median'])
+    isBad = (stats['median'] - threshold) * (bad['median'] - good['median']) > 0
+    print("%s : %s median %.4g (cv %.1f%%, threshold %.4g) -> %s" %
+          (rev, metric, stats['median'], 100.0 * stats['cv'], threshold, 'bad' if isBad else 'good'))
+    return 1 if isBad else 0
+
+
+def bisectReport(logroot, metric='solve time', first=None):
+    """ Prints the measurements of every revision of a bisection and the first bad commit """
+    print("%-12s %3s %10s %10s %7s" % ('revision', 'n', 'min', 'median', 'cv %'))
+    for revdir in sorted(glob.glob(os.path.join(logroot, '*')), key=os.path.getmtime):
+        values = metricValues(revdir, metric)
+        if values:
+            stats = timingStats(values)
+            print("%-12s %3d %10.4g %10.4g %7.1f" %
+                  (os.path.basename(revdir), stats['n'], stats['min'], stats['median'], 100.0 * stats['cv']))
+    if first:
+        print("\nFirst bad commit : %s" % first)
+    else:
+        print("\nThe bisection didn't find a first bad commit")
+
+
+###############################################################################
+def readFirst(filename, default='unknown'):
+    """ Returns the first line of a file, or default """
+    try:
+        with open(filename, 'r') as fd:
+            return fd.readline().strip() or default
+    except IOError:
+        return default
+
+
+def mpiVersion():
+    """ Returns the first line of the version of the MPI launcher, or 'none' """
+    for command in (['mpiexec', '--version'], ['mpirun', '--version'], ['mpichversion']):
+        try:
+            out = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT).communicate()[0]
+        except OSError:
+            continue
+        for line in out.decode(errors='replace').splitlines():
+            if line.strip():
+                return line.strip()
+    return 'none'
+
+
+def fingerprint():
+    """ Returns [(key, value)] describing the node, in the format of campaign.info """
+    cpu = 'unknown'
+    cores = 0
+    try:
+        with open('/proc/cpuinfo', 'r') as fd:
+            for line in fd:
+                if line.startswith('model name') and cpu == 'unknown':
+                    cpu = line.split(':', 1)[1].strip()
+                elif line.startswith('processor'):
+                    cores += 1
+    except IOError:
+        pass
+    memory = 'unknown'
+    try:
+        with open('/proc/meminfo', 'r') as fd:
+            for line in fd:
+                if line.startswith('MemTotal:'):
+                    memory = ' '.join(line.split()[1:])
+    except IOError:
+        pass
+    uname = os.uname()
+    return [('host', uname[1]),
+            ('cpu', cpu),
+            ('cores', str(cores or multiprocessing.cpu_count())),
+            ('governor', readFirst('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor')),
+            ('memory', memory),
+            ('kernel', '%s %s' % (uname[0], uname[2])),
+            ('load', '%.2f %.2f %.2f' % os.getloadavg()),
+            ('mpi', mpiVersion())]
+
+
+def waitForQuiet(maxload=None, wait=600, poll=30):
+    """ Waits until the 1-minute load average of the node is below maxload
+
+    Arguments:
+        maxload (float):  Largest load of a quiet node; by default an eighth
+                          of the cores, but at least 1
+        wait (int):  Longest wait in seconds
+        poll (int):  Seconds between two looks at the load
+
+    Returns:
+        True if the node got quiet in time
+    """
+    if maxload is None:
+        maxload = max(1.0, multiprocessing.cpu_count() / 8.0)
+    start = time.time()
+    while True:
+        load = os.getloadavg()[0]
+        if load <= maxload:
+            return True
+        if time.time() - start >= wait:
+            print("Load %.2f is still above %.2f after %d s" % (load, maxload, wait))
+            return False
+        print("Load %.2f is above %.2f; waiting" % (load, maxload))
+        sys.stdout.flush()
+        time.sleep(poll)
+
+
+###############################################################################
+CPU_DIR = '/sys/devices/system/cpu'
+NODE_DIR = '/sys/devices/system/node'
+
+
+def parseCpuList(text):
+    """ Returns the cpus of a cpu list in the kernel's format, e.g. '0-3,8-11' """
+    cpus = []
+    for part in text.strip().split(','):
+        if '-' in part:
+            (lo, hi) = part.split('-')
+            cpus.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+def formatCpuList(cpus):
+    """ Returns a list of cpus in the kernel's format, which taskset -c takes too """
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(['%d' % lo if lo == hi else '%d-%d' % (lo, hi) for (lo, hi) in ranges])
+
+
+def cpuTopology():
+    """ Reads the cpu topology from /sys
+
+    Returns:
+        list of physical cores, ordered by NUMA node, package and core id.
+        Every core is a dict with its 'node', 'package', 'core' and its
+        hardware threads ('threads', first thread first).
+    """
+    nodes = {}
+    for nodedir in glob.glob(os.path.join(NODE_DIR, 'node[0-9]*')):
+        for cpu in parseCpuList(readFirst(os.path.join(nodedir, 'cpulist'), '')):
+            nodes[cpu] = int(os.path.basename(nodedir)[4:])
+    online = parseCpuList(readFirst(os.path.join(CPU_DIR, 'online'), '')) or \
+        list(range(multiprocessing.cpu_count()))
+
+    cores = {}
+    for cpu in online:
+        topo = os.path.join(CPU_DIR, 'cpu%d' % cpu, 'topology')
+        package = int(readFirst(os.path.join(topo, 'physical_package_id'), '0'))
+        core = int(readFirst(os.path.join(topo, 'core_id'), str(cpu)))
+        key = (nodes.get(cpu, 0), package, core)
+        cores.setdefault(key, []).append(cpu)
+    return [{'node': k[0], 'package': k[1], 'core': k[2], 'threads': sorted(t)}
+            for (k, t) in sorted(cores.items())]
+
+
+def corePlacement(slot=0, nslots=1, nrun=4):
+    """ Returns the cores of one campaign of nslots concurrent ones
+
+    The physical cores are split into nslots contiguous chunks, which follow
+    the NUMA nodes.  The first nrun cores of the chunk of the slot run the
+    examples, one rank per core; the rest of the chunk compiles.  Hardware
+    threads of the run cores are left idle so that they don't disturb the
+    timings.  If the chunk has no spare core, the compiles use the run cores,
+    which is safe as a campaign only compiles between its runs.
+
+    Returns:
+        (run cpus, compile cpus, NUMA nodes of the run cpus)
+    """
+    cores = cpuTopology()
+    size = max(1, len(cores) // max(1, nslots))
+    chunk = cores[slot * size:(slot + 1) * size] or cores[-size:]
+    # Keep the run cores on one NUMA node if the chunk has enough cores on one
+    byNode = collections.OrderedDict()
+    for c in chunk:
+        byNode.setdefault(c['node'], []).append(c)
+    local = max(byNode.values(), key=len)
+    if len(local) >= nrun:
+        run = local[:nrun]
+    else:
+        run = chunk[:nrun]
+    spare = [c for c in chunk if c not in run]
+    runCpus = [c['threads'][0] for c in run]
+    if spare:
+        compileCpus = [t for c in spare for t in c['threads']]
+    else:
+        compileCpus = runCpus
+    return (runCpus, compileCpus, sorted(set([c['node'] for c in run])))
+
+
+###############################################################################
+# Field output.  Nek reports every checkpoint it writes as
+#     <step> <time> done :: Write checkpoint
+#                   file size = <size>B
+#                   avg data-throughput = <rate>MB/s
+# NekWrap.py writes <session>.iowatch.<np>, the field files rank 0 saw
+# appear and grow, for sessions listed in NEK_IOWATCH.
+IO_NUMBER = r'([-+]?\d+\.?\d*(?:[eEdD][-+]?\d+)?)'
+IO_DUMP = re.compile(r'done ::\s+Write checkpoint')
+IO_SIZE = re.compile(r'file size\s*=\s*' + IO_NUMBER + r'\s*([kKMG]?)B')
+IO_RATE = re.compile(r'data-throughput\s*=\s*' + IO_NUMBER + r'\s*([kKMG]?)B/s')
+IO_UNITS = {'': 1.0 / 1024 ** 2, 'k': 1.0 / 1024, 'K': 1.0 / 1024, 'M': 1.0, 'G': 1024.0}
+
+
+def ioWatchStats(watchfile):
+    """ Returns the field output seen by the NekWrap.py watcher, or None
+
+    A file that was complete within one poll is counted as written in one
+    poll interval, so the throughput of small dumps is a lower bound.
+
+    Returns:
+        dict with 'dumps', 'MB', 'seconds' and 'source'
+    """
+    if not os.path.isfile(watchfile):
+        return None
+    poll = 0.05
+    stats = {'dumps': 0, 'MB': 0.0, 'seconds': 0.0, 'source': 'watched'}
+    with open(watchfile, 'r') as fd:
+        for line in fd:
+            cols = line.split()
+            if line.startswith('poll (s)'):
+                poll = float(cols[-1])
+            elif cols and cols[0] == 'file' and len(cols) == 5:
+                stats['dumps'] += 1
+                stats['MB'] += int(cols[4]) / 1024.0 ** 2
+                stats['seconds'] += max(float(cols[3]) - float(cols[2]), poll)
+    return stats if stats['dumps'] else None
+
+
+def ioStats(logfile):
+    """ Returns the field output of a run: nek's own checkpoint lines, or else
+    the <session>.iowatch.<np> file next to the log
+
+    Returns:
+        dict with the number of 'dumps', their size in 'MB', the 'seconds'
+        spent writing them and the 'source' ('nek' or 'watched'), or None if
+        the run wrote no fields
+    """
+    if not os.path.isfile(logfile):
+        return None
+    stats = {'dumps': 0, 'MB': 0.0, 'seconds': 0.0, 'source': 'nek'}
+    size = None
+    with open(logfile, 'r') as fd:
+        for line in fd:
+            if IO_DUMP.search(line):
+                size = None
+                continue
+            match = IO_SIZE.search(line)
+            if match:
+                size = toFloat(match.group(1)) * IO_UNITS[match.group(2)]
+                continue
+            match = IO_RATE.search(line)
+            if match and size is not None:
+                rate = toFloat(match.group(1)) * IO_UNITS[match.group(2)]
+                if rate > 0:
+                    stats['dumps'] += 1
+                    stats['MB'] += size
+                    stats['seconds'] += size / rate
+                size = None
+    if stats['dumps']:
+        return stats
+    match = re.match(r'(.*)\.log\.(\d+)$', logfile)
+    if match:
+        return ioWatchStats('%s.iowatch.%s' % match.groups())
+    return None
+
+
+def ioReport(logdirs, histfile=None, rel=0.25, minMB=1.0, save=True):
+    """ Prints the field output throughput of every run and checks it against the history
+
+    The number of dumps, the MB written and the throughput in MB/s go to the
+    history of the campaign's compiler.  The throughput of a run that wrote at
+    least minMB fails its check if it is more than rel below the median of the
+    last campaigns.
+
+    Arguments:
+        logdirs (list of string):  Log directories of the campaign
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative tolerance of the throughput check
+        minMB (float):  Smallest output whose throughput is checked
+        save (bool):  Add the campaign to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    trusted = timingTrusted(info)
+    num_test = 0
+    num_success = 0
+
+    print("%-28s %6s %10s %10s  %s" % ('run', 'dumps', 'MB', 'MB/s', 'source'))
+    for (logdir, run, logfile) in campaignLogs(logdirs):
+        stats = ioStats(logfile)
+        if not stats:
+            continue
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        rate = stats['MB'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        print("%-28s %6d %10.2f %10.1f  %s" % (name, stats['dumps'], stats['MB'], rate, stats['source']))
+        if not trusted or profiled(info, run):
+            continue
+
+        baseline = history.baseline(logdir, run, 'io MB/s', exclude=info['campaign'])
+        history.add(info, logdir, run, 'io dumps', stats['dumps'])
+        history.add(info, logdir, run, 'io MB', stats['MB'])
+        history.add(info, logdir, run, 'io MB/s', rate)
+        if baseline is None or stats['MB'] < minMB:
+            continue
+        num_test += 1
+        if rate < (1.0 - rel) * baseline:
+            print("[%s] io MB/s : %.1f (baseline %.1f, %+.1f%%)" %
+                  (name, rate, baseline, 100.0 * (rate - baseline) / baseline))
+            print("%s : F " % name)
+        else:
+            num_success += 1
+
+    if save:
+        history.save()
+    print("\n\nIO Summary :     %i/%i throughput checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+# Parameters of a .rea file that the compute-only variant changes, by number:
+# the final time and the output times and steps are turned off, the number
+# of steps is fixed
+REA_PARAMS = re.compile(r'^\s*(\d+)\s+PARAMETERS FOLLOW', re.IGNORECASE)
+COMPUTE_OFF = (10, 14, 15)      # FINTIME, IOTIME, IOSTEP
+COMPUTE_STEPS = 11              # NSTEPS
+STEP_LINE = re.compile(r'^\s*Step\s+(\d+),')
+
+
+def computeRea(reafile, outfile, steps=100):
+    """ Writes the compute-only variant of a .rea file
+
+    The parameters follow the 'PARAMETERS FOLLOW' line, one per line with
+    the value first.  FINTIME, IOTIME and IOSTEP are set to 0 and NSTEPS to
+    steps, so that the run does the same number of steps every time and
+    writes no fields on the way (fields written by the .usr file, and the
+    ones nek writes at the end of a run, are not affected).
+    """
+    with open(reafile, 'r') as fd:
+        lines = fd.readlines()
+    values = dict([(p, 0) for p in COMPUTE_OFF])
+    values[COMPUTE_STEPS] = steps
+    for (i, line) in enumerate(lines):
+        match = REA_PARAMS.match(line)
+        if match:
+            for p in range(1, int(match.group(1)) + 1):
+                if p in values and i + p < len(lines):
+                    lines[i + p] = re.sub(r'^\s*\S+', '  %12.5f' % values[p], lines[i + p], count=1)
+            break
+    else:
+        raise ValueError("no parameters in %s" % reafile)
+    with open(outfile, 'w') as fd:
+        fd.writelines(lines)
+
+
+def stepCount(logfile):
+    """ Returns the number of the last step reported in a logfile, or None """
+    last = None
+    try:
+        with open(logfile, 'r') as fd:
+            for line in fd:
+                match = STEP_LINE.match(line)
+                if match:
+                    last = int(match.group(1))
+    except IOError:
+        pass
+    return last
+
+
+def computeReport(logdirs, histfile=None, rel=0.1, save=True):
+    """ Prints the time per step of the compute-only runs and checks it against the history
+
+    The compute-only runs of an example (COMPUTE_BENCH in RunTests) are logged
+    as <rea>.log.1.c<i>.  Their median solver time per step is compared with
+    the time per step of the regular run, so that the share of the field
+    output shows, and checked against the median of the last campaigns.
+
+    Arguments:
+        logdirs (list of string):  Log directories, e.g. ['srlLog', 'srl2Log']
+        histfile (string):  History file; by default the one of the campaign's compiler
+        rel (float):  Relative tolerance of the time per step check
+        save (bool):  Add the time per step to the history
+    """
+    info = campaignInfo()
+    history = History(histfile or historyFile(info['compiler']))
+    trusted = timingTrusted(info)
+    num_test = 0
+    num_success = 0
+
+    print("%-28s %3s %6s %12s %12s %8s" % ('run', 'n', 'steps', 'compute (ms)', 'regular (ms)', 'output %'))
+    for (logdir, run, logfile) in campaignLogs(logdirs):
+        perStep = []
+        steps = []
+        for f in sorted(glob.glob(logfile + '.c*')):
+            (t, n) = (solverTime(f), stepCount(f))
+            if t is not None and n:
+                perStep.append(t / n)
+                steps.append(n)
+        if not perStep:
+            continue
+        name = '%s/%s' % (os.path.basename(os.path.normpath(logdir)), run)
+        value = median(perStep)
+        (t, n) = (solverTime(logfile), stepCount(logfile))
+        regular = t / n if t is not None and n else None
+        print("%-28s %3d %6d %12.3f %12s %8s" %
+              (name, len(perStep), max(steps), 1000.0 * value,
+               '%.3f' % (1000.0 * regular) if regular else '-',
+               '%.1f' % (100.0 * (regular - value) / regular) if regular else '-'))
+        if not trusted or profiled(info, run):
+            continue
+
+        baseline = history.baseline(logdir, run, 'compute time/step', exclude=info['campaign'],
+                                    speed=info.get('speed'))
+        history.add(info, logdir, run, 'compute time/step', value)
+        if baseline is None:
+            continue
+        num_test += 1
+        if exceeds(value, baseline, rel):
+            historyCheck(name, 'compute time/step', value, baseline, rel)
+            print("%s : F " % name)
+        else:
+            num_success += 1
+
+    if save:
+        history.save()
+    print("\n\nCompute Summary :     %i/%i timing checks were successful" % (num_success, num_test))
+
+
+###############################################################################
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Performance tools for the Nek tests")
+    commands = parser.add_subparsers(dest='command')
+
+    cmd = commands.add_parser('genmap', help="partition quality vs. solver time")
+    cmd.add_argument('logdir', nargs='?', default='./mpiLog')
+    cmd.add_argument('--ranks', type=int, default=4)
+
+    cmd = commands.add_parser('coarse', help="XXT vs. AMG coarse-grid solver comparison")
+    cmd.add_argument('logdir', nargs='?', default='./mpiLog')
+    cmd.add_argument('--rea', default='amg_eddy')
+
+    cmd = commands.add_parser('rusage', help="merge the per-rank resource usage files")
+    cmd.add_argument('logdir')
+
+    cmd = commands.add_parser('heap', help="summarize and diff massif heap profiles")
+    cmd.add_argument('logdir')
+    cmd.add_argument('--store', help="directory that keeps the previous campaign's profiles")
+
+    cmd = commands.add_parser('gprof-diff', help="hotspot changes between two gprof campaigns")
+    cmd.add_argument('old')
+    cmd.add_argument('new')
+    cmd.add_argument('--top', type=int, default=20)
+
+    cmd = commands.add_parser('phases', help="setup/solve/IO timing breakdown with history checks")
+    cmd.add_argument('logdirs', nargs='*', default=LOG_DIRS)
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.25, help="relative tolerance vs. history")
+    cmd.add_argument('--floor', type=float, default=0.5, help="smallest failing change in seconds")
+    cmd.add_argument('--setup-floor', type=float, default=0.02, dest='setupFloor',
+                     help="smallest failing change of a setup phase in seconds")
+    cmd.add_argument('--spread', type=float, default=3.0,
+                     help="history deviations by which a setup phase may vary")
+    cmd.add_argument('--verbose', action='store_true', help="check and print every phase")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('comm', help="communication vs. computation split of the parallel runs")
+    cmd.add_argument('logdirs', nargs='*', default=('mpiLog', 'mpi2Log'))
+    cmd.add_argument('--ranks', type=int, default=4)
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('build', help="build time and binary size of every example with history checks")
+    cmd.add_argument('logdirs', nargs='*', default=LOG_DIRS)
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.25, help="relative tolerance of the time checks")
+    cmd.add_argument('--floor', type=float, default=2.0, help="smallest failing build time change in seconds")
+    cmd.add_argument('--size-rel', dest='sizeRel', type=float, default=0.02,
+                     help="relative tolerance of the binary size checks")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('flags', help="solver time and accuracy of every flag set of the flag matrix benchmark")
+    cmd.add_argument('logdirs', nargs='*', default=('srlLog', 'srl2Log'))
+    cmd.add_argument('--tol', type=float, default=1e-6, help="largest accepted relative error deviation")
+
+    cmd = commands.add_parser('campaigns', help="combined report of the campaigns of several compilers")
+    cmd.add_argument('dirs', nargs='*', default=('PGI', 'GNU', 'INTEL'))
+
+    cmd = commands.add_parser('cross', help="example x discretization x compiler performance matrix")
+    cmd.add_argument('dirs', nargs='*', default=('PGI', 'GNU', 'INTEL'))
+    cmd.add_argument('--slow', type=float, default=0.2, help="highlighted slowdown vs. the row median")
+    cmd.add_argument('--rerun', action='store_true', help="rerun Analysis.py in every directory")
+
+    cmd = commands.add_parser('formulation', help="Pn-Pn vs. Pn-Pn-2 differential report with history of the ratios")
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.15, help="relative change of a ratio that fails")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('repeats', help="min/median/CV of the repeated timing runs with history checks")
+    cmd.add_argument('logdirs', nargs='*', default=('srlLog', 'srl2Log'))
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.1, help="relative tolerance of the median check")
+    cmd.add_argument('--cv', type=float, default=0.05, help="largest trusted coefficient of variation")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('ab', help="paired speedups of an interleaved A/B benchmark (AB_RunTest)")
+    cmd.add_argument('logdir', nargs='?', default='abLog')
+
+    cmd = commands.add_parser('bisect-step', help="classify a revision of Bisect_RunTest (exit status for git bisect run)")
+    cmd.add_argument('logroot')
+    cmd.add_argument('rev')
+    cmd.add_argument('--metric', default='solve time')
+    cmd.add_argument('--check', action='store_true', help="only check that good and bad can be told apart")
+
+    cmd = commands.add_parser('bisect-report', help="measurements of the revisions of a bisection")
+    cmd.add_argument('logroot')
+    cmd.add_argument('--metric', default='solve time')
+    cmd.add_argument('--first', help="first bad commit found by git bisect")
+
+    cmd = commands.add_parser('fingerprint', help="describe the node in the format of campaign.info")
+
+    cmd = commands.add_parser('load-wait', help="wait for a quiet node (exit status 1 if it stays loaded)")
+    cmd.add_argument('--max', type=float, help="largest load of a quiet node (default: cores/8, at least 1)")
+    cmd.add_argument('--wait', type=int, default=600, help="longest wait in seconds")
+
+    cmd = commands.add_parser('cores', help="cores that a campaign runs and compiles on, from the /sys topology")
+    cmd.add_argument('--slot', type=int, default=0, help="index of the campaign among the concurrent ones")
+    cmd.add_argument('--slots', type=int, default=1, help="number of concurrent campaigns")
+    cmd.add_argument('--ranks', type=int, default=4, help="cores that run the examples")
+
+    cmd = commands.add_parser('io', help="field output throughput with history checks")
+    cmd.add_argument('logdirs', nargs='*', default=LOG_DIRS)
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.25, help="relative throughput drop that fails")
+    cmd.add_argument('--min-mb', dest='minMB', type=float, default=1.0, help="smallest output in MB that is checked")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    cmd = commands.add_parser('compute-rea', help="write the compute-only variant of a .rea file")
+    cmd.add_argument('rea')
+    cmd.add_argument('out')
+    cmd.add_argument('--steps', type=int, default=100)
+
+    cmd = commands.add_parser('compute', help="time per step of the compute-only runs with history checks")
+    cmd.add_argument('logdirs', nargs='*', default=['srlLog', 'srl2Log'])
+    cmd.add_argument('--history', help="history file (default: the compiler's in tests/history)")
+    cmd.add_argument('--rel', type=float, default=0.1, help="relative tolerance vs. history")
+    cmd.add_argument('--no-save', dest='save', action='store_false', help="don't add to the history")
+
+    args = parser.parse_args()
+
+    if args.command == 'genmap':
+        genmapReport(args.logdir, args.ranks)
+    elif args.command == 'coarse':
+        coarseReport(args.logdir, args.rea)
+    elif args.command == 'rusage':
+        mergeUsage(args.logdir)
+    elif args.command == 'heap':
+        heapReport(args.logdir, args.store)
+    elif args.command == 'gprof-diff':
+        gprofDiff(args.old, args.new, args.top)
+    elif args.command == 'phases':
+        phaseReport(args.logdirs, args.history, args.rel, args.floor, args.verbose, args.save,
+                    args.setupFloor, args.spread)
+    elif args.command == 'comm':
+        commReport(args.logdirs, args.ranks, args.history, args.save)
+    elif args.command == 'build':
+        buildReport(args.logdirs, args.history, args.rel, args.floor, args.sizeRel, save=args.save)
+    elif args.command == 'flags':
+        flagReport(args.logdirs, args.tol)
+    elif args.command == 'campaigns':
+        campaignsReport(args.dirs)
+    elif args.command == 'cross':
+        crossReport(args.dirs, args.slow, args.rerun)
+    elif args.command == 'formulation':
+        formulationReport(args.history, args.rel, args.save)
+    elif args.command == 'repeats':
+        repeatReport(args.logdirs, args.history, args.rel, args.cv, args.save)
+    elif args.command == 'ab':
+        abReport(args.logdir)
+    elif args.command == 'bisect-step':
+        sys.exit(bisectStep(args.logroot, args.rev, args.metric, args.check))
+    elif args.command == 'bisect-report':
+        bisectReport(args.logroot, args.metric, args.first)
+    elif args.command == 'fingerprint':
+        for (key, value) in fingerprint():
+            print("%-9s %s" % (key, value))
+    elif args.command == 'load-wait':
+        sys.exit(0 if waitForQuiet(args.max, args.wait) else 1)
+    elif args.command == 'cores':
+        (run, comp, nodes) = corePlacement(args.slot, args.slots, args.ranks)
+        print("%s %s %s" % (formatCpuList(run), formatCpuList(comp), ','.join([str(n) for n in nodes])))
+    elif args.command == 'io':
+        ioReport(args.logdirs, args.history, args.rel, args.minMB, args.save)
+    elif args.command == 'compute-rea':
+        computeRea(args.rea, args.out, args.steps)
+    elif args.command == 'compute':
+        computeReport(args.logdirs, args.history, args.rel, args.save)
+    else:
+        parser.print_help()
+        sys.exit(1)
@@ -0,0 +1,354 @@
+#! /usr/bin/python
+# Runs one nek5000 rank and records its resource usage
+#
+# RunTests replaces every nek5000 binary it builds with a script that calls
+#
+#     NekWrap.py ./nek5000.bin [args]
+#
+# so that the nek scripts (nekbb, neklmpi, nek10s, ...) and mpiexec run every
+# rank through this wrapper.  The resource usage of the rank is written to
+# <session>.rusage.<np>.<rank> in the working directory; NekPerf.py rusage
+# merges the files of one run into <session>.rusage.<np>.  Benchmark modes
+# that rerun a case set NEK_RUN_TAG, which is appended to the session name.
+#
+# If the session is listed in NEK_HEAPPROF, rank 0 runs under valgrind massif
+# and writes its heap profile to <session>.massif.<np>.  If it is listed in
+# NEK_GPROF, every rank writes its gprof data to <session>.gmon.<np>.<pid>.
+#
+# If the session is listed in NEK_IOWATCH, rank 0 polls the working directory
+# for the field files of the session while nek runs and writes when each one
+# appeared, stopped growing and its size to <session>.iowatch.<np>.
+#
+# If NEK_RUN_CORES is set (a cpu list like 0-3), rank r is pinned to its
+# (r mod n)th cpu, whatever binding the MPI launcher applied.
+
+import errno
+import os
+import re
+import signal
+import sys
+import time
+
+from NekPerf import parseCpuList
+
+
+###############################################################################
+RANK_VARS = ('OMPI_COMM_WORLD_RANK', 'PMI_RANK', 'MV2_COMM_WORLD_RANK', 'SLURM_PROCID')
+SIZE_VARS = ('OMPI_COMM_WORLD_SIZE', 'PMI_SIZE', 'MV2_COMM_WORLD_SIZE', 'SLURM_NTASKS')
+
+
+def envInt(names, default):
+    """ Returns the integer value of the first environment variable in names that is set """
+    for name in names:
+        if name in os.environ:
+            try:
+                return int(os.environ[name])
+            except ValueError:
+                pass
+    return default
+
+
+def sessionName():
+    """ Returns the session name that the nek scripts write to SESSION.NAME
+
+    If NEK_RUN_TAG is set, it is appended as <session>.<tag>.
+    """
+    try:
+        with open('SESSION.NAME', 'r') as fd:
+            session = fd.readline().strip() or 'nek5000'
+    except IOError:
+        session = 'nek5000'
+    if os.environ.get('NEK_RUN_TAG'):
+        session = '%s.%s' % (session, os.environ['NEK_RUN_TAG'])
+    return session
+
+
+SIZE_TOKEN = re.compile(r'\s*(\d+|[a-z]\w*|[-+*/()])')
+
+
+def sizeExpression(expr, params):
+    """ Evaluates an integer expression of a SIZE parameter statement
+
+    Only integers, known parameters, + - * / (Fortran integer division) and
+    parentheses are allowed.
+
+    Arguments:
+        expr (string):  Expression, e.g. 'lx1-2' or '(lelt*lp)/2'
+        params (dict):  Values of the parameters defined so far
+
+    Returns:
+        int value, or None if the expression uses anything else
+    """
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        match = SIZE_TOKEN.match(expr, pos)
+        if not match:
+            return None
+        tokens.append(match.group(1))
+        pos = match.end()
+
+    def atom(i):
+        tok = tokens[i] if i < len(tokens) else None
+        if tok == '(':
+            (value, i) = sum_(i + 1)
+            if i >= len(tokens) or tokens[i] != ')':
+                raise ValueError(expr)
+            return (value, i + 1)
+        if tok in ('-', '+'):
+            (value, i) = atom(i + 1)
+            return (-value if tok == '-' else value, i)
+        if tok is not None and tok.isdigit():
+            return (int(tok), i + 1)
+        if tok in params:
+            return (params[tok], i + 1)
+        raise ValueError(expr)
+
+    def product(i):
+        (value, i) = atom(i)
+        while i < len(tokens) and tokens[i] in ('*', '/'):
+            (right, j) = atom(i + 1)
+            if tokens[i] == '*':
+                value *= right
+            else:
+                # Fortran truncates towards zero
+                value = abs(value) // abs(right) * (1 if (value < 0) == (right < 0) else -1)
+            i = j
+        return (value, i)
+
+    def sum_(i):
+        (value, i) = product(i)
+        while i < len(tokens) and tokens[i] in ('+', '-'):
+            (right, j) = product(i + 1)
+            value = value + right if tokens[i] == '+' else value - right
+            i = j
+        return (value, i)
+
+    try:
+        (value, i) = sum_(0)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value if i == len(tokens) else None
+
+
+def sizeParameters(sizefile='SIZE'):
+    """ Returns the integer parameters defined in a nek SIZE file
+
+    Parameters defined by simple expressions of other parameters (lelv=lelt,
+    lx2=lx1-2, ...) are evaluated; the rest are skipped.
+    """
+    params = {}
+    try:
+        with open(sizefile, 'r') as fd:
+            text = fd.read()
+    except IOError:
+        return params
+    for stmt in re.findall(r'^\s+parameter\s*\((.*)\)', text, re.MULTILINE | re.IGNORECASE):
+        for assign in stmt.split(','):
+            if '=' not in assign:
+                continue
+            (name, expr) = [t.strip().lower() for t in assign.split('=', 1)]
+            value = sizeExpression(expr, params)
+            if value is not None:
+                params[name] = value
+    return params
+
+
+def runCpu(rank):
+    """ Returns the cpu that a rank is pinned to from NEK_RUN_CORES, or None """
+    try:
+        cpus = parseCpuList(os.environ.get('NEK_RUN_CORES', ''))
+    except ValueError:
+        return None
+    if not cpus:
+        return None
+    return cpus[rank % len(cpus)]
+
+
+def pinner(cpu):
+    """ Returns the command prefix that pins nek to a cpu
+
+    Nothing is needed if this Python can set its own affinity, which the
+    child inherits.
+    """
+    if cpu is None:
+        return []
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, [cpu])
+            return []
+        except OSError:
+            pass
+    return ['taskset', '-c', str(cpu)]
+
+
+def isListed(session, var):
+    """ Returns True if the session (without its NEK_RUN_TAG) is listed in environment variable var """
+    return session.split('.')[0] in os.environ.get(var, '').split()
+
+
+def heapProfiler(session, nranks, rank):
+    """ Returns the valgrind massif command prefix if the session is heap profiled
+
+    Only rank 0 is profiled.  Extra valgrind options can be given in NEK_HEAPPROF_OPTS.
+    """
+    if rank != 0 or not isListed(session, 'NEK_HEAPPROF'):
+        return []
+    return (['valgrind', '--tool=massif', '--massif-out-file=%s.massif.%d' % (session, nranks)] +
+            os.environ.get('NEK_HEAPPROF_OPTS', '').split())
+
+
+# Seconds between two looks at the field files
+WATCH_POLL = 0.05
+
+
+class FieldWatcher(object):
+    """ Watches the working directory for the field files nek writes
+
+    Field files of an earlier run of the session (e.g. the serial run before
+    the parallel one) have the same names, so a file counts once its
+    modification time or size differs from the one it had at the start.
+
+    Attributes:
+        pattern (regex):  Names of the field files of the session
+        start (float):  Time the run started
+        files (dict):  {name: [first seen, last growth, size]}, times from start
+        old (dict):  {name: (mtime, size)} of the field files at the start
+    """
+
+    def __init__(self, session):
+        self.pattern = re.compile(r'^%s\d*\.(f\d{4,5}|fld\d+)$' % re.escape(session.split('.')[0]))
+        self.start = time.time()
+        self.files = {}
+        self.old = {}
+        for name in os.listdir('.'):
+            if self.pattern.match(name):
+                try:
+                    st = os.stat(name)
+                    self.old[name] = (st.st_mtime, st.st_size)
+                except OSError:
+                    pass
+
+    def poll(self):
+        """ Notes field files written since the start and the ones that grew since the last poll """
+        now = time.time() - self.start
+        for name in os.listdir('.'):
+            if not self.pattern.match(name):
+                continue
+            try:
+                st = os.stat(name)
+            except OSError:
+                continue
+            size = st.st_size
+            if name not in self.files:
+                if self.old.get(name) == (st.st_mtime, size):
+                    continue
+            seen = self.files.setdefault(name, [now, now, size])
+            if size != seen[2]:
+                seen[1:] = [now, size]
+
+    def write(self, filename):
+        """ Writes one 'file <name> <first seen> <last growth> <bytes>' line per field file """
+        with open(filename, 'w') as fd:
+            fd.write("poll (s)                 %.3f\n" % WATCH_POLL)
+            for (name, (first, last, size)) in sorted(self.files.items()):
+                fd.write("file %s %.3f %.3f %d\n" % (name, first, last, size))
+
+
+###############################################################################
+def writeUsage(filename, ru, status, rank, cpu=None, profiled=False):
+    """ Writes the resource usage of one rank
+
+    Every line is 'name value', so that the values can be checked with the
+    ['name', target, tolerance, 1] convention of Analysis.py.  The sizes of
+    the binary are in the <case>.build file of build_nek.  A rank that ran
+    under valgrind (profiled) is marked, as its usage is valgrind's.
+    """
+    with open(filename, 'w') as fd:
+        fd.write("exit status              %d\n" % status)
+        fd.write("peak rss (kB)            %d\n" % ru.ru_maxrss)
+        fd.write("user cpu (s)             %.3f\n" % ru.ru_utime)
+        fd.write("sys cpu (s)              %.3f\n" % ru.ru_stime)
+        fd.write("voluntary ctx switches   %d\n" % ru.ru_nvcsw)
+        fd.write("involuntary ctx switches %d\n" % ru.ru_nivcsw)
+        fd.write("major page faults        %d\n" % ru.ru_majflt)
+        fd.write("minor page faults        %d\n" % ru.ru_minflt)
+        if cpu is not None:
+            fd.write("pinned cpu               %d\n" % cpu)
+        if profiled:
+            fd.write("heap profiled            1\n")
+        if rank == 0:
+            params = sizeParameters()
+            for name in ('ldim', 'lx1', 'ly1', 'lz1', 'lx2', 'lelt', 'lelv', 'lp', 'lelg'):
+                if name in params:
+                    fd.write("SIZE %-19s %d\n" % (name, params[name]))
+
+
+def main(argv):
+    if len(argv) < 2:
+        sys.stderr.write("usage: NekWrap.py binary [args]\n")
+        return 2
+
+    binary = argv[1]
+    rank = envInt(RANK_VARS, 0)
+    nranks = envInt(SIZE_VARS, 1)
+    session = sessionName()
+    cpu = runCpu(rank)
+    profiler = heapProfiler(session, nranks, rank)
+    command = pinner(cpu) + profiler + [binary] + argv[2:]
+    if isListed(session, 'NEK_GPROF'):
+        os.environ['GMON_OUT_PREFIX'] = '%s.gmon.%d' % (session, nranks)
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.execvp(command[0], command)
+        finally:
+            os._exit(127)
+
+    # Pass termination signals on to nek
+    def forward(signum, frame):
+        os.kill(pid, signum)
+    for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+        signal.signal(signum, forward)
+
+    watcher = None
+    if rank == 0 and isListed(session, 'NEK_IOWATCH'):
+        watcher = FieldWatcher(session)
+
+    while True:
+        try:
+            if watcher:
+                (wpid, status, ru) = os.wait4(pid, os.WNOHANG)
+                if wpid == 0:
+                    watcher.poll()
+                    time.sleep(WATCH_POLL)
+                    continue
+            else:
+                (wpid, status, ru) = os.wait4(pid, 0)
+            break
+        except OSError as e:
+            if e.errno != errno.EINTR:
+                raise
+
+    if os.WIFSIGNALED(status):
+        code = 128 + os.WTERMSIG(status)
+    else:
+        code = os.WEXITSTATUS(status)
+
+    try:
+        writeUsage('%s.rusage.%d.%d' % (session, nranks, rank), ru, code, rank, cpu, bool(profiler))
+    except IOError as e:
+        sys.stderr.write("NekWrap.py: could not write resource usage: %s\n" % e)
+    if watcher:
+        watcher.poll()
+        try:
+            watcher.write('%s.iowatch.%d' % (session, nranks))
+        except IOError as e:
+            sys.stderr.write("NekWrap.py: could not write the field output: %s\n" % e)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))